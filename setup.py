@@ -7,28 +7,35 @@ Temporary fallback to avoid PEP 517 isolation issues on Render
 from setuptools import setup, find_packages
 import os
 
+HERE = os.path.dirname(__file__)
+
+with open(os.path.join(HERE, 'README.md'), 'r', encoding='utf-8') as fh:
+    LONG_DESCRIPTION = fh.read()
+
+# Build tooling pinned in requirements.txt for Render, not runtime dependencies
+SKIP_PREFIXES = ('#', 'setuptools', 'wheel', 'pip')
+
 # Read requirements from requirements.txt
 def read_requirements():
-    req_path = os.path.join(os.path.dirname(__file__), 'requirements.txt')
+    req_path = os.path.join(HERE, 'requirements.txt')
     with open(req_path, 'r', encoding='utf-8') as f:
-        requirements = []
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith('#') and not line.startswith('setuptools') and not line.startswith('wheel') and not line.startswith('pip'):
-                requirements.append(line)
-        return requirements
+        lines = f.read().splitlines()
+    stripped = (line.strip() for line in lines)
+    return [line for line in stripped if line and not line.startswith(SKIP_PREFIXES)]
+
+INSTALL_REQUIRES = tuple(read_requirements())
 
 setup(
     name="mlj-results-compiler",
     version="0.2.0",
     description="AI-assisted Excel consolidation, grading, and reporting system with Telegram bot and web interface",
-    long_description=open('README.md', 'r', encoding='utf-8').read(),
+    long_description=LONG_DESCRIPTION,
     long_description_content_type="text/markdown",
     author="MLJ Results Compiler Contributors",
     url="https://github.com/io-m1/MLJResultsCompiler",
     packages=find_packages(),
     python_requires=">=3.11",
-    install_requires=read_requirements(),
+    install_requires=list(INSTALL_REQUIRES),
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Environment :: Web Environment",
@@ -4,33 +4,38 @@ Agent Router for MLJ Results Compiler
 Routes requests to specialized processing agents
 """
 
+import importlib
 import logging
 from typing import Dict, Any, Tuple, List, Optional
 from dataclasses import dataclass
 
-# Import specialized agents
+# Only the base interfaces are imported eagerly; specialized agents (and the
+# pandas stack some of them pull in) load the first time they are routed to
 try:
-    from src.agents import (
-        BaseProcessingAgent,
-        ProcessingResult,
-        TestCompilerAgent,
-        DataCleaningAgent,
-        ReportGeneratorAgent,
-    )
-    from src.agents.invoice_agent import InvoiceProcessorAgent
-    from src.agents.ocr_agent import ImageOCRAgent
-    from src.agents.merger_agent import GenericTableMergerAgent
-    AGENTS_AVAILABLE = True
+    from src.agents.base_agent import BaseProcessingAgent, ProcessingResult
 except ImportError as e:
     logging.warning(f"Agents not available: {e}")
-    AGENTS_AVAILABLE = False
     BaseProcessingAgent = None
     ProcessingResult = None
 
 logger = logging.getLogger(__name__)
 
+# Per-intent overrides for the processing config (anything else uses the defaults)
+_OUTPUT_FORMAT = {'report_generation': 'pdf'}
+_MERGE_STRATEGY = {'test_consolidation': 'email', 'table_merge': 'auto'}
 
-@dataclass
+# Agent name -> (module, class), instantiated on first use
+_AGENT_CLASSES: Dict[str, Tuple[str, str]] = {
+    'test_compiler': ('src.agents.test_compiler_agent', 'TestCompilerAgent'),
+    'invoice_processor': ('src.agents.invoice_agent', 'InvoiceProcessorAgent'),
+    'image_ocr': ('src.agents.ocr_agent', 'ImageOCRAgent'),
+    'table_merger': ('src.agents.merger_agent', 'GenericTableMergerAgent'),
+    'data_cleaner': ('src.agents.data_cleaning_agent', 'DataCleaningAgent'),
+    'report_generator': ('src.agents.report_generator_agent', 'ReportGeneratorAgent'),
+}
+
+
+@dataclass(slots=True)
 class ProcessingConfig:
     """Configuration for agent processing"""
     intent: str
@@ -62,25 +67,46 @@ class FallbackAgent:
 class AgentRouter:
     """Routes requests to specialized processing agents"""
     
+    # Routing map - defines which agent handles which intent
+    _ROUTING_MAP: Dict[str, str] = {
+        'test_consolidation': 'test_compiler',
+        'invoice_processing': 'invoice_processor',  # Placeholder
+        'image_extraction': 'image_ocr',     # Placeholder
+        'table_merge': 'table_merger',       # ACTIVE: Real implementation
+        'report_generation': 'report_generator',  # ACTIVE: Real implementation
+        'data_cleaning': 'data_cleaner',     # ACTIVE: Real implementation
+    }
+    
     def __init__(self):
-        """Initialize agent router with available agents"""
-        if AGENTS_AVAILABLE:
-            self.agents = {
-                'test_compiler': TestCompilerAgent(),
-                'invoice_processor': InvoiceProcessorAgent(),
-                'image_ocr': ImageOCRAgent(),
-                'table_merger': GenericTableMergerAgent(),
-                'data_cleaner': DataCleaningAgent(),
-                'report_generator': ReportGeneratorAgent(),
-                'generic': FallbackAgent(),
-            }
-        else:
-            # Fallback if agents not available
-            self.agents = {
-                'generic': FallbackAgent(),
-            }
+        """Initialize agent router; specialized agents are created on first use"""
+        self._fallback = FallbackAgent()
+        self.agents: Dict[str, Any] = {'generic': self._fallback}
         
-        logger.info("Agent Router initialized with agents: " + ", ".join(self.agents.keys()))
+        # intent -> agent instance, filled in as each intent is first routed
+        self._dispatch: Dict[str, Any] = {}
+        self._agent_info: Dict[str, Dict[str, Any]] = {}
+        
+        logger.info("Agent Router initialized with agents: " + ", ".join(self.list_agents()))
+    
+    def _get_agent(self, agent_name: str):
+        """Return the named agent, importing and instantiating it on first use"""
+        agent = self.agents.get(agent_name)
+        if agent is not None:
+            return agent
+        
+        spec = _AGENT_CLASSES.get(agent_name)
+        if spec is None:
+            return self._fallback
+        
+        module_name, class_name = spec
+        try:
+            agent = getattr(importlib.import_module(module_name), class_name)()
+        except ImportError as e:
+            logger.warning(f"Agent {agent_name} not available, using fallback: {e}")
+            agent = self._fallback
+        
+        self.agents[agent_name] = agent
+        return agent
     
     def route(self, intent: str, documents: List[Dict]) -> Tuple[BaseProcessingAgent, ProcessingConfig]:
         """
@@ -93,31 +119,24 @@ class AgentRouter:
         Returns:
             Tuple of (selected_agent, processing_config)
         """
-        # Routing map - defines which agent handles which intent
-        routing_map = {
-            'test_consolidation': 'test_compiler',
-            'invoice_processing': 'invoice_processor',  # Placeholder
-            'image_extraction': 'image_ocr',     # Placeholder
-            'table_merge': 'table_merger',       # ACTIVE: Real implementation
-            'report_generation': 'report_generator',  # ACTIVE: Real implementation
-            'data_cleaning': 'data_cleaner',     # ACTIVE: Real implementation
-        }
-        
-        # Get agent name from routing map
-        agent_name = routing_map.get(intent, 'generic')
-        
-        # Get the agent instance
-        agent = self.agents.get(agent_name, self.agents['generic'])
-        
-        # Verify agent can handle this request
-        if not agent.can_handle(documents, intent):
-            logger.warning(f"Agent {agent_name} cannot handle intent {intent}, using fallback")
-            agent = self.agents['generic']
+        # Get the agent instance for this intent
+        agent = self._dispatch.get(intent)
+        if agent is None:
+            agent_name = self._ROUTING_MAP.get(intent)
+            if agent_name is None:
+                agent = self._fallback
+            else:
+                agent = self._dispatch[intent] = self._get_agent(agent_name)
+        
+        # Verify agent can handle this request (the fallback always can)
+        if agent is not self._fallback and not agent.can_handle(documents, intent):
+            logger.warning(f"Agent {type(agent).__name__} cannot handle intent {intent}, using fallback")
+            agent = self._fallback
         
         # Build processing configuration
         config = self._build_config(intent, documents)
         
-        logger.info(f"Routed intent '{intent}' to agent '{agent_name}'")
+        logger.info(f"Routed intent '{intent}' to agent '{type(agent).__name__}'")
         
         return agent, config
     
@@ -148,19 +167,11 @@ class AgentRouter:
             ProcessingConfig object
         """
         # Extract file formats
-        file_formats = [doc.get('format', '') for doc in documents]
+        file_formats = tuple(doc.get('format', '') for doc in documents)
         
-        # Determine output format based on intent
-        output_format = 'xlsx'  # Default
-        if intent == 'report_generation':
-            output_format = 'pdf'
-        
-        # Determine merge strategy
-        merge_strategy = 'email'
-        if intent == 'test_consolidation':
-            merge_strategy = 'email'
-        elif intent == 'table_merge':
-            merge_strategy = 'auto'
+        # Determine output format and merge strategy based on intent
+        output_format = _OUTPUT_FORMAT.get(intent, 'xlsx')
+        merge_strategy = _MERGE_STRATEGY.get(intent, 'email')
         
         config = ProcessingConfig(
             intent=intent,
@@ -169,7 +180,7 @@ class AgentRouter:
             merge_strategy=merge_strategy,
             custom_options={
                 'file_formats': file_formats,
-                'file_count': len(documents)
+                'file_count': len(file_formats)
             }
         )
         
@@ -177,18 +188,21 @@ class AgentRouter:
     
     def get_agent_info(self, agent_name: str) -> Dict[str, Any]:
         """Get information about a specific agent"""
-        agent = self.agents.get(agent_name)
-        if not agent:
-            return {'exists': False}
-        
-        return {
-            'exists': True,
-            'name': agent_name,
-            'type': type(agent).__name__,
-            'description': agent.__class__.__doc__ or 'No description'
-        }
+        info = self._agent_info.get(agent_name)
+        if info is None:
+            if agent_name not in self.agents and agent_name not in _AGENT_CLASSES:
+                return {'exists': False}
+            agent = self._get_agent(agent_name)
+            info = self._agent_info[agent_name] = {
+                'exists': True,
+                'name': agent_name,
+                'type': type(agent).__name__,
+                'description': type(agent).__doc__ or 'No description'
+            }
+        # Copy so a caller mutating the result can't corrupt the cache
+        return dict(info)
     
     def list_agents(self) -> List[str]:
         """List all available agents"""
-        return list(self.agents.keys())
+        return [*_AGENT_CLASSES, 'generic']
         
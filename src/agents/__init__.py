@@ -3,10 +3,26 @@
 Agents Package - Specialized processing agents for MLJ Results Compiler
 """
 
+import importlib
+
 from .base_agent import BaseProcessingAgent, ProcessingResult
-from .test_compiler_agent import TestCompilerAgent
-from .data_cleaning_agent import DataCleaningAgent
-from .report_generator_agent import ReportGeneratorAgent
+
+# Concrete agents import pandas, so they are loaded on first attribute access
+_LAZY_AGENTS = {
+    'TestCompilerAgent': '.test_compiler_agent',
+    'DataCleaningAgent': '.data_cleaning_agent',
+    'ReportGeneratorAgent': '.report_generator_agent',
+}
+
+
+def __getattr__(name):
+    module = _LAZY_AGENTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     'BaseProcessingAgent',
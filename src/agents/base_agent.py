@@ -5,31 +5,36 @@ Abstract interfaces for specialized processing agents
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Tuple
-from dataclasses import dataclass
+from typing import List, Dict, Any, Tuple, Optional
+from dataclasses import dataclass, field
 import logging
+import os
+import tempfile
+
+# xlsxwriter writes .xlsx noticeably faster than openpyxl's in-memory workbook; its
+# per-string URL/formula regex checks are turned off since the cells are plain data.
+# (Not constant_memory: pandas writes cells column by column, which that mode drops)
+try:
+    import xlsxwriter  # noqa: F401
+    XLSX_WRITER_ENGINE = 'xlsxwriter'
+    XLSX_ENGINE_KWARGS = {'options': {'strings_to_urls': False, 'strings_to_formulas': False}}
+except ImportError:
+    XLSX_WRITER_ENGINE = 'openpyxl'
+    XLSX_ENGINE_KWARGS = {}
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessingResult:
     """Result from agent processing"""
     success: bool
     message: str
     output_file: str = None
     data: Any = None
-    metadata: Dict[str, Any] = None
-    errors: List[str] = None
-    warnings: List[str] = None
-    
-    def __post_init__(self):
-        if self.metadata is None:
-            self.metadata = {}
-        if self.errors is None:
-            self.errors = []
-        if self.warnings is None:
-            self.warnings = []
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    errors: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
 
 
 class BaseProcessingAgent(ABC):
@@ -112,6 +117,24 @@ class BaseProcessingAgent(ABC):
         
         return preview
     
+    @staticmethod
+    def _reserve_output_path(suffix: str, prefix: Optional[str] = None,
+                             directory: Optional[str] = None) -> str:
+        """
+        Create a uniquely named, empty output file and return its path
+        
+        Args:
+            suffix: File extension, including the dot
+            prefix: File name prefix (tempfile's default if None)
+            directory: Where to create it (config['tmp_dir']; the system temp dir if None)
+            
+        Returns:
+            Path of the new file; the caller writes to it and removes it on failure
+        """
+        fd, output_path = tempfile.mkstemp(suffix=suffix, prefix=prefix, dir=directory)
+        os.close(fd)
+        return output_path
+    
     def log_processing(self, documents: List[Dict], config: Dict):
         """Log processing start"""
         logger.info(f"{self.name}: Processing {len(documents)} documents")
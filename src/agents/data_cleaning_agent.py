@@ -5,14 +5,39 @@ SUBSTANTIAL IMPLEMENTATION with real cleaning capabilities
 """
 
 import logging
+import os
 from typing import List, Dict, Tuple, Optional
 from pathlib import Path
+import numpy as np
 import pandas as pd
+from pandas.api.types import is_string_dtype
+from pandas.tseries.api import guess_datetime_format
 import re
-import tempfile
 from datetime import datetime
 
-from .base_agent import BaseProcessingAgent, ProcessingResult
+from .base_agent import BaseProcessingAgent, ProcessingResult, XLSX_ENGINE_KWARGS, XLSX_WRITER_ENGINE
+
+# Arrow-backed columns make the .str cleaning ops and isin checks faster
+try:
+    import pyarrow  # noqa: F401
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+# Rust-backed Excel reader; pandas' default openpyxl engine is already
+# read-only/streaming but converts every cell in Python
+try:
+    import python_calamine  # noqa: F401
+    CALAMINE_AVAILABLE = True
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
+# Beyond this many rows cleaned data defaults to CSV unless a format is requested
+CSV_DEFAULT_ROWS = 100_000
+
+# CSV/TSV inputs larger than this are cleaned in chunks of CSV_CHUNK_ROWS rows
+CHUNKED_CSV_BYTES = 100_000_000
+CSV_CHUNK_ROWS = 100_000
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +45,12 @@ logger = logging.getLogger(__name__)
 class DataCleaningAgent(BaseProcessingAgent):
     """Clean and standardize data with intelligent algorithms"""
     
+    # Placeholder strings treated as missing values
+    NULL_VALUES = frozenset(['', 'N/A', 'NA', 'null', 'NULL', 'None', 'none', '-'])
+    
+    # Column-name keywords that select email/name/date handling (lookahead so overlaps all match)
+    _COL_KIND_RE = re.compile(r'(?=(email|name|date|time))', re.IGNORECASE)
+    
     def __init__(self):
         super().__init__(name="DataCleaningAgent")
     
@@ -91,25 +122,32 @@ class DataCleaningAgent(BaseProcessingAgent):
             }
             
             for doc in documents:
-                # Load data
-                df = self._load_dataframe(doc['path'])
-                if df is None:
-                    continue
-                
-                original_rows = len(df)
-                cleaning_report['total_rows_before'] += original_rows
+                ext = Path(doc['path']).suffix.lower()
                 
-                # Perform cleaning operations
-                df, file_report = self._clean_dataframe(df, config)
+                if ext in ['.csv', '.tsv'] and os.path.getsize(doc['path']) > CHUNKED_CSV_BYTES:
+                    # Too big to hold in memory: clean and write chunk by chunk
+                    original_rows, cleaned_rows, file_report, output_path = \
+                        self._clean_csv_in_chunks(doc['path'], ext, config)
+                else:
+                    # Load data
+                    df = self._load_dataframe(doc['path'])
+                    if df is None:
+                        continue
+                    
+                    original_rows = len(df)
+                    
+                    # Perform cleaning operations
+                    df, file_report = self._clean_dataframe(df, config)
+                    cleaned_rows = len(df)
+                    
+                    # Save cleaned file
+                    output_path = self._save_cleaned_data(df, doc['path'], config)
                 
-                cleaned_rows = len(df)
+                cleaning_report['total_rows_before'] += original_rows
                 cleaning_report['total_rows_after'] += cleaned_rows
                 cleaning_report['duplicates_removed'] += (original_rows - cleaned_rows)
                 cleaning_report['cells_cleaned'] += file_report['cells_cleaned']
                 cleaning_report['issues_fixed'].extend(file_report['issues'])
-                
-                # Save cleaned file
-                output_path = self._save_cleaned_data(df, doc['path'], config)
                 cleaned_files.append(output_path)
                 cleaning_report['files_processed'] += 1
             
@@ -136,52 +174,156 @@ class DataCleaningAgent(BaseProcessingAgent):
     def _load_dataframe(self, file_path: str) -> Optional[pd.DataFrame]:
         """Load dataframe from file"""
         try:
-            path = Path(file_path)
-            ext = path.suffix.lower()
+            ext = Path(file_path).suffix.lower()
+            
+            if ARROW_AVAILABLE:
+                try:
+                    return self._read_file(file_path, ext, use_arrow=True)
+                except ValueError as e:
+                    # The pyarrow engine rejects some inputs the default parsers accept
+                    logger.debug(f"Arrow-backed read of {file_path} failed, retrying: {e}")
             
-            if ext in ['.xlsx', '.xls']:
-                return pd.read_excel(file_path)
-            elif ext == '.csv':
-                return pd.read_csv(file_path)
-            elif ext == '.tsv':
-                return pd.read_csv(file_path, sep='\t')
-            elif ext == '.json':
-                return pd.read_json(file_path)
-            else:
-                logger.warning(f"Unsupported format: {ext}")
-                return None
+            return self._read_file(file_path, ext, use_arrow=False)
         except Exception as e:
             logger.error(f"Error loading {file_path}: {e}")
             return None
     
-    def _clean_dataframe(self, df: pd.DataFrame, config: Dict) -> Tuple[pd.DataFrame, Dict]:
-        """Clean a dataframe"""
+    @staticmethod
+    def _read_file(file_path: str, ext: str, use_arrow: bool) -> Optional[pd.DataFrame]:
+        """Read a data file, optionally into pyarrow-backed columns"""
+        backend = {'dtype_backend': 'pyarrow'} if use_arrow else {}
+        csv_options = {'engine': 'pyarrow', **backend} if use_arrow else {}
+        
+        if ext in ['.xlsx', '.xls']:
+            engine = {'engine': 'calamine'} if CALAMINE_AVAILABLE else {}
+            return pd.read_excel(file_path, **engine, **backend)
+        elif ext == '.csv':
+            return pd.read_csv(file_path, **csv_options)
+        elif ext == '.tsv':
+            return pd.read_csv(file_path, sep='\t', **csv_options)
+        elif ext == '.json':
+            return pd.read_json(file_path, **backend)
+        else:
+            logger.warning(f"Unsupported format: {ext}")
+            return None
+    
+    def _clean_csv_in_chunks(self, file_path: str, ext: str, config: Dict) -> Tuple[int, int, Dict, str]:
+        """
+        Clean a large CSV/TSV chunk by chunk, appending each cleaned chunk to a CSV output
+        
+        Duplicates are dropped across the whole file via a 64-bit hash of every unique
+        row written, so memory grows with the number of unique rows (8 bytes each),
+        not with the chunk size.
+        
+        Returns:
+            (rows read, rows written, cleaning report, output path)
+        """
+        report = {
+            'cells_cleaned': 0,
+            'issues': []
+        }
+        original_rows = cleaned_rows = 0
+        
+        # Sorted row hashes of everything written so far, so duplicates across chunks are dropped too
+        seen_rows = np.empty(0, dtype=np.uint64)
+        cross_chunk_duplicates = 0
+        
+        # Date formats guessed from the first chunk with values, reused for every later
+        # chunk so the same source cell always parses (and hashes) the same way
+        date_formats = {}
+        
+        if config.get('output_format') not in (None, 'csv'):
+            logger.info(f"{file_path} is cleaned in chunks; writing CSV instead of {config['output_format']}")
+        output_path = self._reserve_output_path('.csv', prefix=f"{Path(file_path).stem}_cleaned_",
+                                               directory=config.get('tmp_dir'))
+        
+        # The pyarrow CSV engine can't read in chunks, but Arrow-backed columns still help
+        backend = {'dtype_backend': 'pyarrow'} if ARROW_AVAILABLE else {}
+        sep = '\t' if ext == '.tsv' else ','
+        
+        first = True
+        for chunk in pd.read_csv(file_path, sep=sep, chunksize=CSV_CHUNK_ROWS, **backend):
+            original_rows += len(chunk)
+            cleaned, chunk_report = self._clean_dataframe(chunk, config, date_formats=date_formats)
+            
+            hashes = pd.util.hash_pandas_object(cleaned, index=False).to_numpy()
+            keep = ~pd.Index(hashes).duplicated() & ~self._hashes_seen(hashes, seen_rows)
+            new_rows = np.sort(hashes[keep])
+            seen_rows = np.insert(seen_rows, np.searchsorted(seen_rows, new_rows), new_rows)
+            cross_chunk_duplicates += len(keep) - int(keep.sum())
+            cleaned = cleaned[keep]
+            
+            cleaned.to_csv(output_path, mode='w' if first else 'a', header=first, index=False)
+            first = False
+            
+            cleaned_rows += len(cleaned)
+            report['cells_cleaned'] += chunk_report['cells_cleaned']
+            report['issues'].extend(chunk_report['issues'])
+        
+        # Chunks repeat the same per-column messages; keep each one once
+        report['issues'] = list(dict.fromkeys(report['issues']))
+        if cross_chunk_duplicates:
+            report['issues'].append(f"Removed {cross_chunk_duplicates} duplicate row(s) across chunks")
+        
+        logger.info(f"Saved cleaned data to {output_path}")
+        return original_rows, cleaned_rows, report, output_path
+    
+    @staticmethod
+    def _hashes_seen(hashes: np.ndarray, seen_rows: np.ndarray) -> np.ndarray:
+        """Mask of the hashes already in the sorted array seen_rows"""
+        if not len(seen_rows):
+            return np.zeros(len(hashes), dtype=bool)
+        
+        # Looking up sorted keys walks seen_rows in order instead of jumping around it;
+        # np.isin would re-sort all of seen_rows for every chunk
+        order = np.argsort(hashes)
+        sorted_hashes = hashes[order]
+        positions = np.minimum(np.searchsorted(seen_rows, sorted_hashes), len(seen_rows) - 1)
+        seen = np.empty(len(hashes), dtype=bool)
+        seen[order] = seen_rows[positions] == sorted_hashes
+        return seen
+    
+    def _clean_dataframe(self, df: pd.DataFrame, config: Dict,
+                         date_formats: Optional[Dict] = None) -> Tuple[pd.DataFrame, Dict]:
+        """Clean a dataframe (date_formats: per-column formats shared across chunks, filled in as guessed)"""
         report = {
             'cells_cleaned': 0,
             'issues': []
         }
         
-        # 1. Clean string columns FIRST (before duplicate detection)
-        for col in df.select_dtypes(include=['object']).columns:
-            # Trim whitespace
-            original = df[col].copy()
-            # Convert to string and trim, but preserve NaN
-            df[col] = df[col].apply(lambda x: x.strip() if isinstance(x, str) else x)
-            changed = (original != df[col]).sum()
-            if changed > 0:
-                report['cells_cleaned'] += changed
-                report['issues'].append(f"Trimmed whitespace in {changed} cell(s) in column '{col}'")
-        
-        # 2. Standardize email addresses
+        # Per-cell change counts cost an extra comparison per text column
+        detailed_report = config.get('detailed_report', True)
+        
+        # Text columns: numpy object columns, or string columns when loaded Arrow-backed
+        object_cols = {col for col, dtype in df.dtypes.items() if is_string_dtype(dtype)}
+        
+        # Classify each column once; both passes below reuse it
+        col_kinds = {}
         for col in df.columns:
-            if 'email' in col.lower():
-                df[col] = df[col].apply(lambda x: x.lower().strip() if isinstance(x, str) else x)
-                report['issues'].append(f"Standardized emails in column '{col}'")
+            kinds = {kind.lower() for kind in self._COL_KIND_RE.findall(str(col))}
+            col_kinds[col] = ('email' in kinds, 'name' in kinds, bool(kinds & {'date', 'time'}))
         
-        # 3. Standardize names (title case)
+        # 1-3. Clean string columns FIRST (before duplicate detection), one column at a time
         for col in df.columns:
-            if 'name' in col.lower():
-                df[col] = df[col].apply(lambda x: x.title() if isinstance(x, str) else x)
+            is_email, is_name, _ = col_kinds[col]
+            
+            # 1. Trim whitespace, but preserve NaN and non-string cells
+            if col in object_cols:
+                original = df[col]
+                df[col] = self._map_strings(original, lambda s: s.strip())
+                changed = (original.ne(df[col]) & original.notna()).sum() if detailed_report else 0
+                if changed > 0:
+                    report['cells_cleaned'] += changed
+                    report['issues'].append(f"Trimmed whitespace in {changed} cell(s) in column '{col}'")
+            
+            # 2. Standardize email addresses
+            if is_email:
+                df[col] = self._map_strings(df[col], lambda s: s.lower().str.strip())
+                report['issues'].append(f"Standardized emails in column '{col}'")
+            
+            # 3. Standardize names (title case)
+            if is_name:
+                df[col] = self._map_strings(df[col], lambda s: s.title())
                 report['issues'].append(f"Standardized names in column '{col}'")
         
         # 4. NOW remove duplicate rows (after cleaning so duplicates are properly detected)
@@ -198,57 +340,86 @@ class DataCleaningAgent(BaseProcessingAgent):
             removed = before_empty - len(df)
             report['issues'].append(f"Removed {removed} empty row(s)")
         
-        # 6. Detect and fix common data issues
-        for col in df.columns:
-            # Replace common null values with NaN
-            null_values = ['', 'N/A', 'NA', 'null', 'NULL', 'None', 'none', '-']
-            for null_val in null_values:
-                mask = df[col].astype(str) == null_val
-                if mask.any():
-                    df.loc[mask, col] = pd.NA
-                    count = mask.sum()
-                    report['cells_cleaned'] += count
-        
-        # 7. Try to standardize date columns
+        # 6-7. Placeholder nulls and dates are fixed after dedup, again one column at a time
         for col in df.columns:
-            if 'date' in col.lower() or 'time' in col.lower():
-                try:
-                    df[col] = pd.to_datetime(df[col], errors='coerce')
+            # 6. Replace common null values with NaN
+            mask = df[col].astype(str).isin(self.NULL_VALUES)
+            if mask.any():
+                df.loc[mask, col] = pd.NA
+                report['cells_cleaned'] += mask.sum()
+            
+            # 7. Try to standardize date columns
+            if col_kinds[col][2]:
+                if date_formats is None:
+                    fmt = self._guess_date_format(df[col])
+                else:
+                    if date_formats.get(col) is None:
+                        date_formats[col] = self._guess_date_format(df[col])
+                    fmt = date_formats[col]
+                parsed = self._parse_dates(df[col], fmt)
+                if parsed is not None:
+                    df[col] = parsed
                     report['issues'].append(f"Standardized dates in column '{col}'")
-                except:
-                    pass
         
         return df, report
     
+    @staticmethod
+    def _guess_date_format(series: pd.Series) -> Optional[str]:
+        """strptime format of the first non-null value, or None if there is none or it isn't a date"""
+        non_null = series.dropna()
+        if non_null.empty:
+            return None
+        return guess_datetime_format(str(non_null.iat[0]))
+    
+    @staticmethod
+    def _parse_dates(series: pd.Series, fmt: Optional[str]) -> Optional[pd.Series]:
+        """
+        Parse a column as datetimes with the vectorized parser
+        
+        fmt is the guessed format (see _guess_date_format); columns mixing formats fall
+        back to format='mixed'. Returns None if nothing parses (not really a date column).
+        """
+        if series.isna().all():
+            return None
+        
+        try:
+            parsed = pd.to_datetime(series, format=fmt, errors='coerce') if fmt else None
+            if parsed is None or parsed.isna().sum() > series.isna().sum():
+                parsed = pd.to_datetime(series, format='mixed', errors='coerce')
+        except (TypeError, ValueError, OverflowError):
+            return None
+        
+        return None if parsed.isna().all() else parsed
+    
+    @staticmethod
+    def _map_strings(series: pd.Series, op) -> pd.Series:
+        """Apply a vectorized .str operation to the string cells, leaving other cells as they were"""
+        try:
+            result = op(series.str)
+        except AttributeError:
+            # No string values in this column
+            return series
+        return result.where(result.notna(), series)
+    
     def _save_cleaned_data(self, df: pd.DataFrame, original_path: str, config: Dict) -> str:
         """Save cleaned data"""
-        output_format = config.get('output_format', 'xlsx')
-        original_name = Path(original_path).stem
+        output_format = config.get('output_format') or ('csv' if len(df) > CSV_DEFAULT_ROWS else 'xlsx')
         
-        if output_format == 'xlsx':
-            output_file = tempfile.NamedTemporaryFile(
-                mode='wb', suffix='.xlsx', delete=False, 
-                prefix=f"{original_name}_cleaned_"
-            )
-            output_path = output_file.name
-            output_file.close()
-            df.to_excel(output_path, index=False)
-        elif output_format == 'csv':
-            output_file = tempfile.NamedTemporaryFile(
-                mode='w', suffix='.csv', delete=False,
-                prefix=f"{original_name}_cleaned_"
-            )
-            output_path = output_file.name
-            output_file.close()
-            df.to_csv(output_path, index=False)
+        # Unknown formats fall back to Excel
+        if output_format == 'csv':
+            suffix, write = '.csv', lambda path: df.to_csv(path, index=False)
         else:
-            output_file = tempfile.NamedTemporaryFile(
-                mode='wb', suffix='.xlsx', delete=False,
-                prefix=f"{original_name}_cleaned_"
-            )
-            output_path = output_file.name
-            output_file.close()
-            df.to_excel(output_path, index=False)
+            suffix, write = '.xlsx', lambda path: df.to_excel(path, index=False, engine=XLSX_WRITER_ENGINE,
+                                                              engine_kwargs=XLSX_ENGINE_KWARGS)
+        
+        output_path = self._reserve_output_path(suffix, prefix=f"{Path(original_path).stem}_cleaned_",
+                                               directory=config.get('tmp_dir'))
+        try:
+            write(output_path)
+        except Exception:
+            # Don't leave a partial file behind in the temp directory
+            os.unlink(output_path)
+            raise
         
         logger.info(f"Saved cleaned data to {output_path}")
         return output_path
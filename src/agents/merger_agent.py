@@ -5,13 +5,35 @@ SUBSTANTIAL IMPLEMENTATION with real merging capabilities
 """
 
 import logging
+import os
 from typing import List, Dict, Tuple, Optional
 from pathlib import Path
+import numpy as np
 import pandas as pd
-from difflib import SequenceMatcher
-import tempfile
 
-from .base_agent import BaseProcessingAgent, ProcessingResult
+from .base_agent import BaseProcessingAgent, ProcessingResult, XLSX_ENGINE_KWARGS, XLSX_WRITER_ENGINE
+
+# Native readers: pyarrow's multi-threaded CSV parser and the Rust calamine Excel engine
+try:
+    import pyarrow  # noqa: F401
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+try:
+    import python_calamine  # noqa: F401
+    CALAMINE_AVAILABLE = True
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
+# Multi-threaded Rust hash joins for many-to-many merges
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
+EXCEL_MAX_DATA_ROWS = 1_048_575
 
 logger = logging.getLogger(__name__)
 
@@ -85,12 +107,15 @@ class GenericTableMergerAgent(BaseProcessingAgent):
             # Load all tables
             dataframes = []
             for doc in documents:
-                df = self._load_dataframe(doc['path'])
+                # Parsed once; loading and naming read suffix/name from it
+                path = Path(doc['path'])
+                df = self._load_dataframe(path)
                 if df is not None:
                     dataframes.append({
                         'df': df,
-                        'name': Path(doc['path']).name,
-                        'path': doc['path']
+                        'name': path.name,
+                        'path': doc['path'],
+                        'columns_lower': self._lowercase_column_map(df)
                     })
             
             if len(dataframes) < 2:
@@ -104,8 +129,13 @@ class GenericTableMergerAgent(BaseProcessingAgent):
             merge_column = self._detect_merge_column(dataframes)
             logger.info(f"Detected merge column: {merge_column}")
             
-            # Merge all tables
-            merged_df = self._merge_tables(dataframes, merge_column, config)
+            # Shrink the tables before joining; keys stay as loaded so they still line up
+            for df_dict in dataframes:
+                key = df_dict['columns_lower'].get(str(merge_column).lower())
+                df_dict['df'] = self._optimize_dtypes(df_dict['df'], skip=key)
+            
+            # Merge all tables, then hand callers the dtypes they loaded
+            merged_df = self._restore_dtypes(self._merge_tables(dataframes, merge_column, config))
             
             # Save result
             output_path = self._save_merged_table(merged_df, config)
@@ -137,23 +167,37 @@ class GenericTableMergerAgent(BaseProcessingAgent):
             self.log_result(result)
             return result
     
-    def _load_dataframe(self, file_path: str) -> Optional[pd.DataFrame]:
+    def _load_dataframe(self, path: Path) -> Optional[pd.DataFrame]:
         """Load a dataframe from file"""
         try:
-            path = Path(file_path)
             ext = path.suffix.lower()
             
-            if ext in ['.xlsx', '.xls']:
-                return pd.read_excel(file_path)
-            elif ext == '.csv':
-                return pd.read_csv(file_path)
-            elif ext == '.tsv':
-                return pd.read_csv(file_path, sep='\t')
-            else:
-                logger.warning(f"Unsupported format: {ext}")
-                return None
+            if ARROW_AVAILABLE and ext in ['.csv', '.tsv']:
+                try:
+                    return self._read_file(path, ext, use_arrow=True)
+                except ValueError as e:
+                    # pyarrow's parser is stricter than pandas' C parser on malformed rows
+                    logger.debug(f"pyarrow read of {path} failed, retrying: {e}")
+            
+            return self._read_file(path, ext, use_arrow=False)
         except Exception as e:
-            logger.error(f"Error loading {file_path}: {e}")
+            logger.error(f"Error loading {path}: {e}")
+            return None
+    
+    @staticmethod
+    def _read_file(path: Path, ext: str, use_arrow: bool) -> Optional[pd.DataFrame]:
+        """Read a data file with the fastest available engine (numpy-backed columns)"""
+        csv_engine = {'engine': 'pyarrow'} if use_arrow else {}
+        
+        if ext in ['.xlsx', '.xls']:
+            engine = {'engine': 'calamine'} if CALAMINE_AVAILABLE else {}
+            return pd.read_excel(path, **engine)
+        elif ext == '.csv':
+            return pd.read_csv(path, **csv_engine)
+        elif ext == '.tsv':
+            return pd.read_csv(path, sep='\t', **csv_engine)
+        else:
+            logger.warning(f"Unsupported format: {ext}")
             return None
     
     def _detect_merge_column(self, dataframes: List[Dict]) -> str:
@@ -161,56 +205,105 @@ class GenericTableMergerAgent(BaseProcessingAgent):
         if not dataframes:
             return None
         
-        # Get columns from first dataframe
-        first_cols = set(dataframes[0]['df'].columns.str.lower())
+        first_cols = dataframes[0]['columns_lower']
         
         # Find columns common to all dataframes
-        common_columns = first_cols
-        for df_dict in dataframes[1:]:
-            df_cols = set(df_dict['df'].columns.str.lower())
-            common_columns = common_columns.intersection(df_cols)
+        common_columns = set(first_cols).intersection(*(d['columns_lower'] for d in dataframes[1:]))
         
         logger.info(f"Common columns: {common_columns}")
         
-        # Prioritize known key columns
+        # Prioritize known key columns (returned with the first table's casing)
         for key_col in self.common_key_columns:
             if key_col in common_columns:
-                # Find the actual column name (with original casing)
-                for col in dataframes[0]['df'].columns:
-                    if col.lower() == key_col:
-                        return col
-        
-        # If no known key column, use first common column
-        if common_columns:
-            target_col = list(common_columns)[0]
-            for col in dataframes[0]['df'].columns:
-                if col.lower() == target_col:
-                    return col
+                return first_cols[key_col]
+        
+        # If no known key column, use the first common column of the first table
+        for lower, col in first_cols.items():
+            if lower in common_columns:
+                return col
         
         # Fallback: use first column
         return dataframes[0]['df'].columns[0]
     
+    @staticmethod
+    def _merge_with_polars(first: pd.DataFrame, tables: List[Tuple[pd.DataFrame, str]],
+                           merge_column: str) -> pd.DataFrame:
+        """Chain of full outer joins in polars, mirroring the pandas merge chain"""
+        result = pl.from_pandas(first).lazy()
+        for df, name in tables:
+            result = result.join(pl.from_pandas(df).lazy(), on=merge_column, how='full',
+                                 coalesce=True, suffix=f'_from_{name}', nulls_equal=True,
+                                 maintain_order='left_right')
+        
+        # pandas orders outer-join keys lexicographically
+        result = result.sort(merge_column, nulls_last=True, maintain_order=True)
+        merged = result.collect().to_pandas()
+        
+        # polars hands back None for missing text; pandas' merge fills with NaN
+        text_cols = merged.columns[merged.dtypes == object]
+        if len(text_cols):
+            merged[text_cols] = merged[text_cols].fillna(np.nan)
+        return merged
+    
+    @staticmethod
+    def _optimize_dtypes(df: pd.DataFrame, skip: Optional[str] = None) -> pd.DataFrame:
+        """
+        Downcast integer columns and turn repetitive text columns into categoricals
+        
+        Floats are left at float64: downcasting them would change the values written out.
+        """
+        if not len(df) or not df.columns.is_unique:
+            return df
+        
+        df = df.copy(deep=False)
+        for col, dtype in df.dtypes.items():
+            if col == skip:
+                continue
+            if pd.api.types.is_integer_dtype(dtype):
+                df[col] = pd.to_numeric(df[col], downcast='integer')
+            elif dtype == 'object' and df[col].nunique() / len(df) < 0.5:
+                df[col] = df[col].astype('category')
+        
+        return df
+    
+    @staticmethod
+    def _restore_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+        """Undo _optimize_dtypes on the merged table: categoricals back to object, narrow ints to int64"""
+        restore = {}
+        for col, dtype in df.dtypes.items():
+            if isinstance(dtype, pd.CategoricalDtype):
+                restore[col] = object
+            elif pd.api.types.is_integer_dtype(dtype) and dtype != 'int64' and dtype.kind == 'i':
+                restore[col] = 'int64'
+        return df.astype(restore, copy=False) if restore else df
+    
+    @staticmethod
+    def _lowercase_column_map(df: pd.DataFrame) -> Dict[str, str]:
+        """Map lowercased column names to the original names (first one wins on clashes)"""
+        columns = {}
+        for col in df.columns:
+            columns.setdefault(str(col).lower(), col)
+        return columns
+    
     def _merge_tables(self, dataframes: List[Dict], merge_column: str, 
                      config: Dict) -> pd.DataFrame:
         """Merge multiple tables on a common column"""
         if not dataframes:
             return pd.DataFrame()
         
-        # Start with first dataframe
-        result = dataframes[0]['df'].copy()
+        # Start with first dataframe (shallow copies: adding the source column
+        # gives the copy a new block without duplicating the loaded data)
+        result = dataframes[0]['df'].copy(deep=False)
         result['_source_1'] = dataframes[0]['name']
         
-        # Merge each subsequent dataframe
+        # Line up each subsequent dataframe on the merge column
+        tables = []
         for i, df_dict in enumerate(dataframes[1:], start=2):
-            df = df_dict['df'].copy()
+            df = df_dict['df'].copy(deep=False)
             df[f'_source_{i}'] = df_dict['name']
             
             # Find the merge column in this dataframe (case-insensitive)
-            merge_col_in_df = None
-            for col in df.columns:
-                if col.lower() == merge_column.lower():
-                    merge_col_in_df = col
-                    break
+            merge_col_in_df = df_dict['columns_lower'].get(str(merge_column).lower())
             
             if merge_col_in_df is None:
                 logger.warning(f"Merge column not found in {df_dict['name']}, skipping")
@@ -218,40 +311,94 @@ class GenericTableMergerAgent(BaseProcessingAgent):
             
             # Rename column to match if needed
             if merge_col_in_df != merge_column:
-                df = df.rename(columns={merge_col_in_df: merge_column})
+                df = df.rename(columns={merge_col_in_df: merge_column}, copy=False)
             
-            # Perform merge (outer join to keep all records)
+            tables.append((df, df_dict['name']))
+        
+        if self._keys_align(result, tables, merge_column):
+            try:
+                return self._concat_on_key(result, tables, merge_column)
+            except TypeError as e:
+                # Keys that can't be sorted together; the merge chain reports these properly
+                logger.debug(f"Single-pass merge failed, merging table by table: {e}")
+        
+        # Opt-in: the pandas<->polars conversions only pay off with several cores to join on
+        if POLARS_AVAILABLE and config.get('engine') == 'polars' and len(tables) >= 2:
+            try:
+                return self._merge_with_polars(result, tables, merge_column)
+            except (ImportError, TypeError, ValueError, pl.exceptions.PolarsError) as e:
+                # e.g. pyarrow missing for the conversion, or key dtypes that differ between tables
+                logger.debug(f"Polars merge failed, merging with pandas: {e}")
+        
+        # Duplicate or missing keys: merge one table at a time (outer join to keep all records)
+        for df, name in tables:
             result = pd.merge(result, df, on=merge_column, how='outer', 
-                            suffixes=('', f'_from_{df_dict["name"]}'))
+                            suffixes=('', f'_from_{name}'), sort=False, copy=False)
         
         return result
     
+    @staticmethod
+    def _keys_align(first: pd.DataFrame, tables: List[Tuple[pd.DataFrame, str]], merge_column: str) -> bool:
+        """True if every table has unique, non-missing merge keys of the same dtype"""
+        key_dtype = first[merge_column].dtype
+        for df in [first, *(df for df, _ in tables)]:
+            keys = df[merge_column]
+            if keys.dtype != key_dtype or not keys.is_unique or keys.isna().any():
+                return False
+        return True
+    
+    @staticmethod
+    def _concat_on_key(first: pd.DataFrame, tables: List[Tuple[pd.DataFrame, str]],
+                       merge_column: str) -> pd.DataFrame:
+        """
+        Outer-join all tables in one pass by aligning them on the merge column
+        
+        Same rows and columns as the pairwise outer merges (keys sorted, clashing
+        columns suffixed with _from_<file>), but the key index is built once.
+        """
+        columns = list(first.columns)
+        seen = set(columns)
+        frames = [first.set_index(merge_column)]
+        
+        for df, name in tables:
+            renames = {col: f'{col}_from_{name}' for col in df.columns
+                       if col != merge_column and col in seen}
+            df = df.rename(columns=renames, copy=False)
+            new_columns = [col for col in df.columns if col != merge_column]
+            columns.extend(new_columns)
+            seen.update(new_columns)
+            frames.append(df.set_index(merge_column))
+        
+        merged = pd.concat(frames, axis=1, join='outer', sort=True)
+        merged.index.name = merge_column
+        return merged.reset_index()[columns]
+    
     def _save_merged_table(self, df: pd.DataFrame, config: Dict) -> str:
         """Save merged table to file"""
         output_format = config.get('output_format', 'xlsx')
         
-        # Create temp output file
-        if output_format == 'xlsx':
-            output_file = tempfile.NamedTemporaryFile(
-                mode='wb', suffix='.xlsx', delete=False
-            )
-            output_path = output_file.name
-            output_file.close()
-            df.to_excel(output_path, index=False)
-        elif output_format == 'csv':
-            output_file = tempfile.NamedTemporaryFile(
-                mode='w', suffix='.csv', delete=False
-            )
-            output_path = output_file.name
-            output_file.close()
-            df.to_csv(output_path, index=False)
+        # A worksheet holds 1,048,576 rows including the header; larger merges go to CSV
+        row_limit = config.get('csv_fallback_rows', EXCEL_MAX_DATA_ROWS)
+        if output_format != 'csv' and len(df) > row_limit:
+            logger.info(f"Merged table has {len(df):,} rows (over {row_limit:,}); saving as CSV")
+            output_format = 'csv'
+        
+        if output_format == 'csv':
+            suffix, write = '.csv', lambda path: df.to_csv(path, index=False)
         else:
-            output_file = tempfile.NamedTemporaryFile(
-                mode='wb', suffix='.xlsx', delete=False
-            )
-            output_path = output_file.name
-            output_file.close()
-            df.to_excel(output_path, index=False)
+            # xlsx, and the fallback for unknown formats
+            suffix, write = '.xlsx', lambda path: df.to_excel(path, index=False, engine=XLSX_WRITER_ENGINE,
+                                                              engine_kwargs=XLSX_ENGINE_KWARGS)
+        
+        # Create temp output file (config['tmp_dir'] can point it at a faster filesystem)
+        output_path = self._reserve_output_path(suffix, directory=config.get('tmp_dir'))
+        
+        try:
+            write(output_path)
+        except Exception:
+            # Don't leave a partial file behind in the temp directory
+            os.unlink(output_path)
+            raise
         
         logger.info(f"Saved merged table to {output_path}")
         return output_path
@@ -5,16 +5,48 @@ SUBSTANTIAL IMPLEMENTATION with real report generation capabilities
 """
 
 import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import List, Dict, Tuple, Optional
 from pathlib import Path
 import pandas as pd
-import tempfile
 from datetime import datetime
 
-from .base_agent import BaseProcessingAgent, ProcessingResult
+from .base_agent import BaseProcessingAgent, ProcessingResult, XLSX_ENGINE_KWARGS, XLSX_WRITER_ENGINE
+
+# Native readers: pyarrow's multi-threaded CSV parser and the Rust calamine Excel engine
+try:
+    import pyarrow  # noqa: F401
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+try:
+    import python_calamine  # noqa: F401
+    CALAMINE_AVAILABLE = True
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
+# Row-hashing every row for the duplicate count is skipped above this size
+DUPLICATE_CHECK_ROWS = 500_000
+
+# Text columns with more distinct values than this get their most common value from a sample
+MODE_SAMPLE_THRESHOLD = 100_000
+MODE_SAMPLE_SIZE = 10_000
+
+# With config['parallel'], batches smaller than this (total input bytes) are still
+# reported in-process: each pool worker re-imports pandas, which costs more than small reports
+PARALLEL_REPORT_BYTES = 50_000_000
 
 logger = logging.getLogger(__name__)
 
+# Shared worker pool, created on first parallel batch and reused for later ones
+_report_pool = None
+_report_pool_lock = threading.Lock()
+
 
 class ReportGeneratorAgent(BaseProcessingAgent):
     """Generate formatted reports from data with statistics and summaries"""
@@ -78,17 +110,22 @@ class ReportGeneratorAgent(BaseProcessingAgent):
             return result
         
         try:
-            reports = []
+            # Parsed once; loading and naming read suffix/stem/name from these
+            paths = [Path(doc['path']) for doc in documents]
             
-            for doc in documents:
-                # Load data
-                df = self._load_dataframe(doc['path'])
-                if df is None:
-                    continue
-                
-                # Generate report
-                report_path = self._generate_report(df, doc, config)
-                reports.append(report_path)
+            report_paths = None
+            if self._use_process_pool(documents, config):
+                # Reports are independent and CPU-bound (pandas + workbook writing)
+                try:
+                    report_paths = list(_get_report_pool().map(_generate_report_worker, documents, paths,
+                                                               [config] * len(documents)))
+                except BrokenProcessPool as e:
+                    logger.warning(f"Report worker pool failed, generating reports in-process: {e}")
+                    _discard_report_pool()
+            if report_paths is None:
+                report_paths = [self._report_for_document(doc, config, path) for doc, path in zip(documents, paths)]
+            
+            reports = [path for path in report_paths if path is not None]
             
             if not reports:
                 return ProcessingResult(
@@ -120,130 +157,215 @@ class ReportGeneratorAgent(BaseProcessingAgent):
             self.log_result(result)
             return result
     
-    def _load_dataframe(self, file_path: str) -> Optional[pd.DataFrame]:
+    @staticmethod
+    def _use_process_pool(documents: List[Dict], config: Dict) -> bool:
+        """Opt-in (config['parallel']) and only for several CPUs, documents and large enough inputs"""
+        if not config.get('parallel', False) or len(documents) < 2 or (os.cpu_count() or 1) < 2:
+            return False
+        total_bytes = sum(os.path.getsize(doc['path']) for doc in documents)
+        return total_bytes >= config.get('parallel_min_bytes', PARALLEL_REPORT_BYTES)
+    
+    def _report_for_document(self, doc: Dict, config: Dict, path: Optional[Path] = None) -> Optional[str]:
+        """Load one document and write its report; None if it couldn't be loaded"""
+        path = path or Path(doc['path'])
+        df = self._load_dataframe(path)
+        if df is None:
+            return None
+        return self._generate_report(df, doc, config, path=path)
+    
+    def _load_dataframe(self, path: Path) -> Optional[pd.DataFrame]:
         """Load dataframe from file"""
         try:
-            path = Path(file_path)
             ext = path.suffix.lower()
             
-            if ext in ['.xlsx', '.xls']:
-                return pd.read_excel(file_path)
-            elif ext == '.csv':
-                return pd.read_csv(file_path)
-            elif ext == '.tsv':
-                return pd.read_csv(file_path, sep='\t')
-            elif ext == '.json':
-                return pd.read_json(file_path)
-            else:
-                logger.warning(f"Unsupported format: {ext}")
-                return None
+            if ARROW_AVAILABLE and ext in ['.csv', '.tsv']:
+                try:
+                    return self._read_file(path, ext, use_arrow=True)
+                except ValueError as e:
+                    # pyarrow's parser is stricter than pandas' C parser on malformed rows
+                    logger.debug(f"pyarrow read of {path} failed, retrying: {e}")
+            
+            return self._read_file(path, ext, use_arrow=False)
         except Exception as e:
-            logger.error(f"Error loading {file_path}: {e}")
+            logger.error(f"Error loading {path}: {e}")
+            return None
+    
+    @staticmethod
+    def _read_file(path: Path, ext: str, use_arrow: bool) -> Optional[pd.DataFrame]:
+        """Read a data file with the fastest available engine (numpy-backed columns)"""
+        csv_engine = {'engine': 'pyarrow'} if use_arrow else {}
+        
+        if ext in ['.xlsx', '.xls']:
+            engine = {'engine': 'calamine'} if CALAMINE_AVAILABLE else {}
+            return pd.read_excel(path, **engine)
+        elif ext == '.csv':
+            return pd.read_csv(path, **csv_engine)
+        elif ext == '.tsv':
+            return pd.read_csv(path, sep='\t', **csv_engine)
+        elif ext == '.json':
+            return pd.read_json(path)
+        else:
+            logger.warning(f"Unsupported format: {ext}")
             return None
     
-    def _generate_report(self, df: pd.DataFrame, doc: Dict, config: Dict) -> str:
-        """Generate comprehensive report"""
-        original_name = Path(doc['path']).stem
+    def _generate_report(self, df: pd.DataFrame, doc: Dict, config: Dict, path: Optional[Path] = None) -> str:
+        """Generate comprehensive report (path: doc['path'] already parsed, if the caller has it)"""
+        path = path or Path(doc['path'])
+        original_name = path.stem
         
         # Create Excel file with multiple sheets
-        output_file = tempfile.NamedTemporaryFile(
-            mode='wb', suffix='.xlsx', delete=False,
-            prefix=f"{original_name}_report_"
-        )
-        output_path = output_file.name
-        output_file.close()
+        output_path = self._reserve_output_path('.xlsx', prefix=f"{original_name}_report_",
+                                                directory=config.get('tmp_dir'))
         
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-            # Sheet 1: Summary
-            summary = self._generate_summary(df, doc)
-            summary_df = pd.DataFrame(list(summary.items()), columns=['Metric', 'Value'])
-            summary_df.to_excel(writer, sheet_name='Summary', index=False)
-            
-            # Sheet 2: Data Overview (first 100 rows)
-            df.head(100).to_excel(writer, sheet_name='Data Preview', index=False)
-            
-            # Sheet 3: Column Analysis
-            column_analysis = self._analyze_columns(df)
-            column_analysis.to_excel(writer, sheet_name='Column Analysis', index=False)
-            
-            # Sheet 4: Missing Data Report
-            missing_report = self._analyze_missing_data(df)
-            missing_report.to_excel(writer, sheet_name='Missing Data', index=False)
-            
-            # Sheet 5: Numeric Statistics (if any numeric columns)
-            numeric_cols = df.select_dtypes(include=['number']).columns
-            if len(numeric_cols) > 0:
-                stats = df[numeric_cols].describe()
-                stats.to_excel(writer, sheet_name='Numeric Statistics')
+        # One missing-value pass, shared by the summary, column and missing data sheets
+        na_col = df.isna().sum()
+        numeric_cols = df.select_dtypes(include=['number']).columns
+        
+        try:
+            with pd.ExcelWriter(output_path, engine=XLSX_WRITER_ENGINE, engine_kwargs=XLSX_ENGINE_KWARGS) as writer:
+                # Sheet 1: Summary
+                summary = self._generate_summary(df, doc, path=path, na_col=na_col, numeric_cols=numeric_cols,
+                                                 deep_memory=config.get('deep_memory', False),
+                                                 duplicate_limit=config.get('dup_threshold', DUPLICATE_CHECK_ROWS))
+                summary_df = pd.DataFrame(list(summary.items()), columns=['Metric', 'Value'])
+                summary_df.to_excel(writer, sheet_name='Summary', index=False)
+                
+                # Sheet 2: Data Overview (first 100 rows)
+                df.head(100).to_excel(writer, sheet_name='Data Preview', index=False)
+                
+                # Sheet 3: Column Analysis
+                column_analysis = self._analyze_columns(df, na_col=na_col)
+                column_analysis.to_excel(writer, sheet_name='Column Analysis', index=False)
+                
+                # Sheet 4: Missing Data Report
+                missing_report = self._analyze_missing_data(df, na_col=na_col)
+                missing_report.to_excel(writer, sheet_name='Missing Data', index=False)
+                
+                # Sheet 5: Numeric Statistics (if any numeric columns)
+                if len(numeric_cols) > 0:
+                    stats = df[numeric_cols].describe()
+                    stats.to_excel(writer, sheet_name='Numeric Statistics')
+        except Exception:
+            # Don't leave a partial workbook behind in the temp directory
+            os.unlink(output_path)
+            raise
         
         logger.info(f"Generated report at {output_path}")
         return output_path
     
-    def _generate_summary(self, df: pd.DataFrame, doc: Dict) -> Dict:
-        """Generate summary statistics"""
+    def _generate_summary(self, df: pd.DataFrame, doc: Dict, path: Optional[Path] = None,
+                          na_col: Optional[pd.Series] = None,
+                          numeric_cols: Optional[pd.Index] = None, deep_memory: bool = False,
+                          duplicate_limit: int = DUPLICATE_CHECK_ROWS) -> Dict:
+        """Generate summary statistics (deep_memory also sizes the Python objects in text columns)"""
+        path = path or Path(doc['path'])
+        if na_col is None:
+            na_col = df.isna().sum()
+        if numeric_cols is None:
+            numeric_cols = df.select_dtypes(include=['number']).columns
+        total_na = na_col.sum()
+        
+        if len(df) < duplicate_limit:
+            duplicate_rows = df.duplicated().sum()
+        else:
+            duplicate_rows = f"Not computed (over {duplicate_limit:,} rows)"
+        
         summary = {
             'Report Generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'Source File': Path(doc['path']).name,
+            'Source File': path.name,
             'Total Rows': len(df),
             'Total Columns': len(df.columns),
-            'Numeric Columns': len(df.select_dtypes(include=['number']).columns),
+            'Numeric Columns': len(numeric_cols),
             'Text Columns': len(df.select_dtypes(include=['object']).columns),
             'Date Columns': len(df.select_dtypes(include=['datetime']).columns),
             'Total Cells': len(df) * len(df.columns),
-            'Missing Cells': df.isna().sum().sum(),
-            'Missing %': f"{(df.isna().sum().sum() / (len(df) * len(df.columns)) * 100):.2f}%",
-            'Duplicate Rows': df.duplicated().sum(),
-            'Memory Usage (MB)': f"{df.memory_usage(deep=True).sum() / 1024 / 1024:.2f}"
+            'Missing Cells': total_na,
+            'Missing %': f"{(total_na / (len(df) * len(df.columns)) * 100):.2f}%",
+            'Duplicate Rows': duplicate_rows,
+            'Memory Usage (MB)': f"{df.memory_usage(deep=deep_memory).sum() / 1024 / 1024:.2f}"
         }
         return summary
     
-    def _analyze_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _analyze_columns(self, df: pd.DataFrame, na_col: Optional[pd.Series] = None) -> pd.DataFrame:
         """Analyze each column"""
-        analysis = []
+        if len(df.columns) == 0:
+            return pd.DataFrame()
         
-        for col in df.columns:
-            col_data = {
-                'Column Name': col,
-                'Data Type': str(df[col].dtype),
-                'Non-Null Count': df[col].notna().sum(),
-                'Null Count': df[col].isna().sum(),
-                'Null %': f"{(df[col].isna().sum() / len(df) * 100):.2f}%",
-                'Unique Values': df[col].nunique(),
-                'Duplicate Values': len(df[col]) - df[col].nunique()
-            }
-            
-            # Add type-specific analysis
-            if df[col].dtype in ['int64', 'float64']:
-                col_data['Min'] = df[col].min()
-                col_data['Max'] = df[col].max()
-                col_data['Mean'] = f"{df[col].mean():.2f}" if pd.notna(df[col].mean()) else 'N/A'
-                col_data['Median'] = df[col].median()
-            elif df[col].dtype == 'object':
-                # Most common value
-                if df[col].notna().any():
-                    most_common = df[col].value_counts().index[0] if len(df[col].value_counts()) > 0 else 'N/A'
-                    col_data['Most Common'] = str(most_common)[:50]  # Truncate long values
-            
-            analysis.append(col_data)
+        # Whole-frame reductions, one result per column
+        nulls = df.isna().sum() if na_col is None else na_col
+        non_null = len(df) - nulls
+        uniques = df.nunique()
+        
+        analysis = pd.DataFrame({
+            'Column Name': df.columns,
+            'Data Type': df.dtypes.astype(str),
+            'Non-Null Count': non_null,
+            'Null Count': nulls,
+            'Null %': (nulls / len(df) * 100).map('{:.2f}%'.format),
+            'Unique Values': uniques,
+            'Duplicate Values': len(df) - uniques
+        }, index=df.columns)
+        
+        # Type-specific analysis, added in the order the column types first appear
+        extras = []
+        
+        numeric_cols = [col for col, dtype in df.dtypes.items() if dtype in ['int64', 'float64']]
+        if numeric_cols:
+            stats = df[numeric_cols].agg(['min', 'max', 'mean', 'median']).T
+            extras.append((df.columns.get_loc(numeric_cols[0]), pd.DataFrame({
+                'Min': stats['min'],
+                'Max': stats['max'],
+                'Mean': stats['mean'].map(lambda m: f"{m:.2f}" if pd.notna(m) else 'N/A'),
+                'Median': stats['median']
+            })))
+        
+        # Most common value
+        text_cols = [col for col, dtype in df.dtypes.items() if dtype == 'object' and non_null[col] > 0]
+        if text_cols:
+            most_common = {}
+            for col in text_cols:
+                value, sampled = self._most_common(df[col], uniques[col], non_null[col])
+                most_common[col] = str(value)[:50]  # Truncate long values
+                if sampled:
+                    most_common[col] += f" (est. from {MODE_SAMPLE_SIZE:,}-row sample)"
+            extras.append((df.columns.get_loc(text_cols[0]), pd.DataFrame({'Most Common': pd.Series(most_common)})))
         
-        return pd.DataFrame(analysis)
+        for _, extra in sorted(extras, key=lambda item: item[0]):
+            analysis = analysis.join(extra)
+        
+        return analysis.reset_index(drop=True)
+    
+    @staticmethod
+    def _most_common(series: pd.Series, unique_count: int, non_null_count: int) -> Tuple[object, bool]:
+        """
+        Most frequent value of a column, cheap for high-cardinality columns
+        
+        value_counts is used rather than mode(): mode() returns (and sorts) every tied
+        value, which is slower on ID-like columns.
+        
+        Returns:
+            (value, True if it was estimated from a sample rather than counted exactly)
+        """
+        values = series.dropna()
+        if unique_count == non_null_count:
+            # Every value appears once, so none is more common than the first
+            return values.iat[0], False
+        if unique_count > MODE_SAMPLE_THRESHOLD and len(values) > MODE_SAMPLE_SIZE:
+            # Estimate from a fixed sample instead of hashing the whole column
+            sample = values.sample(n=MODE_SAMPLE_SIZE, random_state=0)
+            return sample.value_counts().index[0], True
+        return values.value_counts().index[0], False
     
-    def _analyze_missing_data(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _analyze_missing_data(self, df: pd.DataFrame, na_col: Optional[pd.Series] = None) -> pd.DataFrame:
         """Analyze missing data patterns"""
-        missing_data = []
+        if na_col is None:
+            na_col = df.isna().sum()
         
-        for col in df.columns:
-            missing_count = df[col].isna().sum()
-            if missing_count > 0:
-                missing_data.append({
-                    'Column': col,
-                    'Missing Count': missing_count,
-                    'Missing %': f"{(missing_count / len(df) * 100):.2f}%",
-                    'Present Count': df[col].notna().sum(),
-                    'Present %': f"{(df[col].notna().sum() / len(df) * 100):.2f}%"
-                })
+        # Sort the counts before building the sheet rather than sorting the finished frame
+        missing = na_col[na_col > 0].sort_values(ascending=False)
+        present = len(df) - missing
         
-        if not missing_data:
+        if missing.empty:
             # No missing data
             return pd.DataFrame([{
                 'Column': 'No missing data found',
@@ -253,4 +375,34 @@ class ReportGeneratorAgent(BaseProcessingAgent):
                 'Present %': '100.00%'
             }])
         
-        return pd.DataFrame(missing_data).sort_values('Missing Count', ascending=False)
+        return pd.DataFrame({
+            'Column': missing.index,
+            'Missing Count': missing.values,
+            'Missing %': (missing / len(df) * 100).map('{:.2f}%'.format).values,
+            'Present Count': present.values,
+            'Present %': (present / len(df) * 100).map('{:.2f}%'.format).values
+        })
+
+
+def _generate_report_worker(doc: Dict, path: Path, config: Dict) -> Optional[str]:
+    """Process pool entry point (module level so it can be pickled)"""
+    return ReportGeneratorAgent()._report_for_document(doc, config, path)
+
+
+def _get_report_pool() -> ProcessPoolExecutor:
+    """The shared report worker pool, created on first use"""
+    global _report_pool
+    with _report_pool_lock:
+        if _report_pool is None:
+            _report_pool = ProcessPoolExecutor(max_workers=os.cpu_count(),
+                                               mp_context=multiprocessing.get_context('spawn'))
+        return _report_pool
+
+
+def _discard_report_pool():
+    """Drop a broken pool so the next parallel batch starts a fresh one"""
+    global _report_pool
+    with _report_pool_lock:
+        pool, _report_pool = _report_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
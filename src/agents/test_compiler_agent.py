@@ -12,6 +12,8 @@ from .base_agent import BaseProcessingAgent, ProcessingResult
 
 logger = logging.getLogger(__name__)
 
+SPREADSHEET_FORMATS = frozenset({'.xlsx', '.xls', '.csv'})
+
 
 class TestCompilerAgent(BaseProcessingAgent):
     """
@@ -41,7 +43,7 @@ class TestCompilerAgent(BaseProcessingAgent):
         # Check if all documents are Excel files
         for doc in documents:
             file_format = doc.get('format', '').lower()
-            if file_format not in ['.xlsx', '.xls', '.csv']:
+            if file_format not in SPREADSHEET_FORMATS:
                 logger.warning(f"TestCompilerAgent: Unsupported format {file_format}")
                 return False
         
@@ -77,7 +79,7 @@ class TestCompilerAgent(BaseProcessingAgent):
             
             # Check format
             file_format = doc.get('format', '').lower()
-            if file_format not in ['.xlsx', '.xls', '.csv']:
+            if file_format not in SPREADSHEET_FORMATS:
                 errors.append(f"Document {i+1}: Unsupported format {file_format}")
         
         is_valid = len(errors) == 0
@@ -11,21 +11,39 @@ Capabilities:
 """
 
 import os
+import re
 import json
 import logging
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from functools import cached_property, lru_cache
+from typing import Deque, Dict, Iterator, List, Optional, Any
 
 logger = logging.getLogger(__name__)
 
 # Try to import Groq
 try:
+    import httpx
     from groq import Groq
     GROQ_AVAILABLE = True
 except ImportError:
     GROQ_AVAILABLE = False
     logger.warning("Groq not installed, using thoughtful fallback")
 
+# HTTP/2 lets concurrent chats share one Groq connection (httpx[http2] extra)
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Aho-Corasick automaton for intent keyword matching (optional)
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 # Import self-healing engine
 try:
     from src.self_healing import get_healing_engine, self_heal
@@ -51,12 +69,93 @@ class AugmentedAssistant:
     - cold_email: Precision cold email generation
     """
     
+    # Intent keywords in priority order - the first intent with a matching
+    # keyword wins (data actions are agentic, so they are checked first)
+    INTENT_KEYWORDS = (
+        ("data_action", (
+            "add column", "add a column", "new column",
+            "random score", "randomly score", "generate score",
+            "add grade", "grade them", "letter grade",
+            "pass fail", "passed failed", "pass or fail",
+            "collate", "sum score", "total score", "average score",
+            "add rank", "ranking", "rank them",
+            "remove column", "delete column",
+            "rename column",
+            "filter", "sort", "order by",
+            "modify", "change", "update", "adjust"
+        )),
+        ("cold_email", ("cold email", "email", "outreach", "pitch", "reach out")),
+        ("consolidate", ("consolidate", "merge", "combine", "process")),
+        ("upload", ("upload", "add", "file")),
+        ("bonus", ("bonus", "score", "grade", "percent", "calculation")),
+        ("download", ("download", "result", "get", "ready")),
+        ("troubleshoot", ("error", "problem", "issue", "fail", "broken", "not working", "wrong")),
+        ("explain", ("how", "what", "explain", "help", "work")),
+        ("status", ("status", "progress", "where")),
+    )
+    
+    # Phrases that request each data agent action; parse_data_request checks
+    # them per action, and their union gates out ordinary chat messages
+    DATA_REQUEST_KEYWORDS = (
+        ("add_random_scores", ("random score", "randomly score", "generate score")),
+        ("add_grades", ("add grade", "letter grade", "grade them")),
+        ("add_pass_fail", ("pass fail", "passed failed", "pass or fail")),
+        ("collate_scores", ("collate", "sum score", "total score", "average")),
+        ("add_rank", ("add rank", "ranking", "rank them")),
+        ("calculate_bonus", ("calculate bonus", "apply bonus", "participation bonus")),
+        ("sort_data", ("sort", "order by")),
+    )
+    
+    # Conversation turns kept per assistant; older turns are dropped
+    MAX_HISTORY = 200
+    
+    # Most recent turns sent to the LLM with each message
+    LLM_CONTEXT_TURNS = 6
+    
+    # Seconds an idle Groq connection is kept open; the SDK default of 5s
+    # means most chat turns would pay a fresh TCP + TLS handshake
+    GROQ_KEEPALIVE_SECONDS = 120
+    
+    # Distinct normalized messages whose intent is remembered
+    INTENT_CACHE_SIZE = 1024
+    
+    # Context note wording for each session status
+    STATUS_NOTES = {
+        "uploading": "user is uploading files",
+        "consolidating": "consolidation in progress",
+        "completed": "consolidation complete, results ready",
+        "error": "an error occurred recently"
+    }
+    
+    # Frontend instructions for each suggested action
+    FRONTEND_ACTIONS = {
+        "show_download": {"type": "navigate", "target": "results"},
+        "show_status": {"type": "display", "target": "session_info"},
+        "show_diagnostics": {"type": "display", "target": "error_details"},
+        "trigger_consolidate": {"type": "action", "target": "consolidate"}
+    }
+    
     def __init__(self):
-        self.conversation_history: List[Dict] = []
-        self.groq_client = None
+        self.conversation_history: Deque[Dict] = deque(maxlen=self.MAX_HISTORY)
+        # Recent turns already in Groq's {"role", "content"} shape
+        self._llm_messages: Deque[Dict] = deque(maxlen=self.LLM_CONTEXT_TURNS)
         self.llm_enabled = False
         self.session_context: Dict = {}
         self.current_mode = "consolidation"  # Default mode
+        self._intent_automaton = self._build_intent_automaton()
+        self._intent_patterns = [
+            (intent, re.compile("|".join(map(re.escape, keywords))))
+            for intent, keywords in self.INTENT_KEYWORDS
+        ]
+        self._data_request_patterns = {
+            action: re.compile("|".join(map(re.escape, keywords)))
+            for action, keywords in self.DATA_REQUEST_KEYWORDS
+        }
+        self._data_request_gate = re.compile("|".join(
+            re.escape(keyword) for _, keywords in self.DATA_REQUEST_KEYWORDS for keyword in keywords
+        ))
+        # Per-instance cache so repeated questions skip keyword matching
+        self._classify_intent = lru_cache(maxsize=self.INTENT_CACHE_SIZE)(self._match_intent)
         
         # Initialize self-healing
         self.healing_engine = None
@@ -76,15 +175,10 @@ class AugmentedAssistant:
         except Exception as e:
             logger.warning(f"Data Agent init failed: {e}")
         
-        # Initialize Groq
-        api_key = os.getenv("GROQ_API_KEY")
-        if GROQ_AVAILABLE and api_key:
-            try:
-                self.groq_client = Groq(api_key=api_key)
-                self.llm_enabled = True
-                logger.info("✓ Augmented Intelligence initialized")
-            except Exception as e:
-                logger.error(f"Failed to initialize: {e}")
+        # Groq client itself is created on first LLM call (see groq_client)
+        if GROQ_AVAILABLE and os.getenv("GROQ_API_KEY"):
+            self.llm_enabled = True
+            logger.info("✓ Augmented Intelligence initialized")
         else:
             logger.warning("GROQ_API_KEY not set, using thoughtful fallback")
         
@@ -94,6 +188,10 @@ class AugmentedAssistant:
             "cold_email": self._get_cold_email_prompt(),
             "data_agent": self._get_data_agent_prompt()
         }
+        self._system_messages = {
+            mode: {"role": "system", "content": prompt}
+            for mode, prompt in self.system_prompts.items()
+        }
         
         # Thoughtful fallback responses
         self.fallback_responses = {
@@ -107,6 +205,32 @@ class AugmentedAssistant:
             "default": "I'm here to help! What do you need?"
         }
     
+    @cached_property
+    def groq_client(self):
+        """
+        Groq client, created on first use so fallback-only processes and
+        health checks never pay for its HTTP/TLS setup.
+        Its connection pool lives as long as the singleton assistant.
+        Disables the LLM and re-raises if the client cannot be created.
+        """
+        if not self.llm_enabled:
+            return None
+        try:
+            http_client = httpx.Client(
+                http2=HTTP2_AVAILABLE,
+                timeout=httpx.Timeout(30.0, connect=5.0),
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=20,
+                    keepalive_expiry=self.GROQ_KEEPALIVE_SECONDS
+                )
+            )
+            return Groq(api_key=os.getenv("GROQ_API_KEY"), http_client=http_client)
+        except Exception as e:
+            logger.error(f"Failed to initialize: {e}")
+            self.llm_enabled = False
+            raise
+    
     def _get_data_agent_prompt(self) -> str:
         """System prompt for data manipulation mode"""
         return """You are an Augmented Intelligence assistant with DATA MANIPULATION capabilities.
@@ -217,7 +341,9 @@ When user provides incomplete info, ask for what's missing. Be direct, not robot
         """Switch between assistant modes"""
         if mode in self.system_prompts:
             self.current_mode = mode
-            self.conversation_history = []  # Clear history on mode switch
+            # Clear history on mode switch
+            self.conversation_history.clear()
+            self._llm_messages.clear()
             logger.info(f"Mode switched to: {mode}")
             return {"success": True, "mode": mode}
         else:
@@ -351,21 +477,7 @@ Output strictly in JSON format."""
         Analyze message and respond with augmented intelligence.
         Context-aware, naturally capable, self-healing.
         """
-        
-        # Update context if provided
-        if context:
-            self.set_session_context(context)
-        
-        # Record interaction
-        self.conversation_history.append({
-            "timestamp": datetime.now().isoformat(),
-            "role": "user",
-            "content": message,
-            "session_id": session_id
-        })
-        
-        # Gather insights (subtle agency)
-        insights = self._gather_insights(message, session_id)
+        insights = self._begin_turn(message, session_id, context)
         
         # Generate response with self-healing
         if self.llm_enabled:
@@ -373,25 +485,82 @@ Output strictly in JSON format."""
                 response = self._get_augmented_response(message, insights)
                 return response
             except Exception as e:
-                # Self-healing: log error and attempt recovery
-                if self.healing_engine:
-                    recovery = self.healing_engine.log_error(
-                        error=e,
-                        context={
-                            "message": message[:200],
-                            "session_id": session_id,
-                            "insights": insights
-                        },
-                        component="ai_assistant"
-                    )
-                    logger.warning(f"Self-healing: {recovery['recovery'].get('action', 'logged')}")
-                else:
-                    logger.error(f"LLM error: {e}")
-                
+                self._log_llm_error(e, message, session_id, insights)
                 return self._get_thoughtful_fallback(message, insights)
         else:
             return self._get_thoughtful_fallback(message, insights)
     
+    def stream_response(self, message: str, session_id: Optional[str] = None, context: Optional[Dict] = None) -> Iterator[str]:
+        """
+        Stream the reply as text chunks as they arrive from Groq.
+        The full reply is recorded in history once the stream ends; if the
+        LLM is unavailable or fails before any output, the thoughtful
+        fallback is yielded as a single chunk.
+        """
+        insights = self._begin_turn(message, session_id, context)
+        
+        if self.llm_enabled:
+            parts = []
+            try:
+                stream = self.groq_client.chat.completions.create(
+                    model="llama-3.1-70b-versatile",
+                    messages=self._build_llm_messages(insights),
+                    max_tokens=400,
+                    temperature=0.7,
+                    stream=True
+                )
+                for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        parts.append(delta)
+                        yield delta
+            except Exception as e:
+                self._log_llm_error(e, message, session_id, insights)
+            
+            if parts:
+                self._record_turn("assistant", "".join(parts), datetime.now().isoformat())
+                return
+        
+        yield self._get_thoughtful_fallback(message, insights)["response"]
+    
+    def _begin_turn(self, message: str, session_id: Optional[str], context: Optional[Dict]) -> Dict:
+        """Record the user's message and gather insights for the reply"""
+        # Update context if provided
+        if context:
+            self.set_session_context(context)
+        
+        # Record interaction
+        self._record_turn("user", message, datetime.now().isoformat(), session_id=session_id)
+        
+        # Gather insights (subtle agency)
+        return self._gather_insights(message, session_id)
+    
+    def _record_turn(self, role: str, content: str, timestamp: str, **extra):
+        """Append a turn to the history and to the LLM context window"""
+        self.conversation_history.append({
+            "timestamp": timestamp,
+            "role": role,
+            "content": content,
+            **extra
+        })
+        self._llm_messages.append({"role": role, "content": content})
+    
+    def _log_llm_error(self, error: Exception, message: str, session_id: Optional[str], insights: Dict):
+        """Self-healing: log an LLM error and attempt recovery"""
+        if self.healing_engine:
+            recovery = self.healing_engine.log_error(
+                error=error,
+                context={
+                    "message": message[:200],
+                    "session_id": session_id,
+                    "insights": insights
+                },
+                component="ai_assistant"
+            )
+            logger.warning(f"Self-healing: {recovery['recovery'].get('action', 'logged')}")
+        else:
+            logger.error(f"LLM error: {error}")
+    
     def _gather_insights(self, message: str, session_id: Optional[str]) -> Dict:
         """
         Subtly gather context and insights.
@@ -414,57 +583,47 @@ Output strictly in JSON format."""
         
         return insights
     
+    def _build_intent_automaton(self):
+        """Build one Aho-Corasick automaton over all intent keywords.
+        
+        Each keyword maps to the priority of the first intent listing it, so
+        a single pass over the message yields every hit and the lowest
+        priority wins. Returns None when pyahocorasick is not installed.
+        """
+        if not AHOCORASICK_AVAILABLE:
+            return None
+        
+        automaton = ahocorasick.Automaton()
+        for priority, (_, keywords) in enumerate(self.INTENT_KEYWORDS):
+            for keyword in keywords:
+                if keyword not in automaton:
+                    automaton.add_word(keyword, priority)
+        automaton.make_automaton()
+        return automaton
+    
     def _detect_intent(self, message: str) -> str:
         """Detect user intent from message"""
-        message_lower = message.lower()
-        
-        # DATA MANIPULATION intents (check first - these are agentic actions)
-        data_action_keywords = [
-            "add column", "add a column", "new column",
-            "random score", "randomly score", "generate score",
-            "add grade", "grade them", "letter grade",
-            "pass fail", "passed failed", "pass or fail",
-            "collate", "sum score", "total score", "average score",
-            "add rank", "ranking", "rank them",
-            "remove column", "delete column",
-            "rename column",
-            "filter", "sort", "order by",
-            "modify", "change", "update", "adjust"
-        ]
-        if any(kw in message_lower for kw in data_action_keywords):
-            return "data_action"
-        
-        # Cold email related intents
-        if any(w in message_lower for w in ["cold email", "email", "outreach", "pitch", "reach out"]):
-            return "cold_email"
-        
-        # Consolidation related intents
-        if any(w in message_lower for w in ["consolidate", "merge", "combine", "process"]):
-            return "consolidate"
-        elif any(w in message_lower for w in ["upload", "add", "file"]):
-            return "upload"
-        elif any(w in message_lower for w in ["bonus", "score", "grade", "percent", "calculation"]):
-            return "bonus"
-        elif any(w in message_lower for w in ["download", "result", "get", "ready"]):
-            return "download"
-        elif any(w in message_lower for w in ["error", "problem", "issue", "fail", "broken", "not working", "wrong"]):
-            return "troubleshoot"
-        elif any(w in message_lower for w in ["how", "what", "explain", "help", "work"]):
-            return "explain"
-        elif any(w in message_lower for w in ["status", "progress", "where"]):
-            return "status"
-        else:
-            return "general"
+        return self._classify_intent(message.lower().strip())
     
-    def _get_augmented_response(self, message: str, insights: Dict) -> Dict:
-        """Generate response with LLM + context awareness"""
-        
+    def _match_intent(self, message_lower: str) -> str:
+        """Match a lowercased message against the intent keyword table"""
+        if self._intent_automaton is not None:
+            best = min((priority for _, priority in self._intent_automaton.iter(message_lower)), default=None)
+            return self.INTENT_KEYWORDS[best][0] if best is not None else "general"
+        
+        for intent, pattern in self._intent_patterns:
+            if pattern.search(message_lower):
+                return intent
+        return "general"
+    
+    def _build_llm_messages(self, insights: Dict) -> List[Dict]:
+        """Build the Groq message list: system prompt, context, recent turns"""
         # Build context-enriched prompt
         context_note = self._build_context_note(insights)
         
         # Use mode-specific system prompt
-        system_prompt = self.system_prompts.get(self.current_mode, self.system_prompts["consolidation"])
-        messages = [{"role": "system", "content": system_prompt}]
+        system_message = self._system_messages.get(self.current_mode, self._system_messages["consolidation"])
+        messages = [system_message]
         
         # Add context as system note if available
         if context_note:
@@ -473,14 +632,13 @@ Output strictly in JSON format."""
                 "content": f"CURRENT CONTEXT (use naturally, don't announce): {context_note}"
             })
         
-        # Add conversation history
-        for entry in self.conversation_history[-6:]:
-            role = entry.get("role", "user")
-            if role in ["user", "assistant"]:
-                messages.append({"role": role, "content": entry.get("content", "")})
-        
-        # Add current message
-        messages.append({"role": "user", "content": message})
+        # Add recent turns - these already end with the current message
+        messages.extend(self._llm_messages)
+        return messages
+    
+    def _get_augmented_response(self, message: str, insights: Dict) -> Dict:
+        """Generate response with LLM + context awareness"""
+        messages = self._build_llm_messages(insights)
         
         # Call Groq
         completion = self.groq_client.chat.completions.create(
@@ -491,13 +649,10 @@ Output strictly in JSON format."""
         )
         
         response_text = completion.choices[0].message.content
+        ts = datetime.now().isoformat()
         
         # Record response
-        self.conversation_history.append({
-            "timestamp": datetime.now().isoformat(),
-            "role": "assistant",
-            "content": response_text
-        })
+        self._record_turn("assistant", response_text, ts)
         
         # Determine if any actions should happen (subtle agency)
         suggested_action = self._suggest_action(insights)
@@ -506,7 +661,7 @@ Output strictly in JSON format."""
             "response": response_text,
             "intent": insights["user_intent"],
             "action": suggested_action,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": ts,
             "augmented": True
         }
     
@@ -518,13 +673,7 @@ Output strictly in JSON format."""
             notes.append(f"{insights['files_uploaded']} file(s) uploaded")
         
         if insights["session_status"]:
-            status_map = {
-                "uploading": "user is uploading files",
-                "consolidating": "consolidation in progress",
-                "completed": "consolidation complete, results ready",
-                "error": "an error occurred recently"
-            }
-            notes.append(status_map.get(insights["session_status"], insights["session_status"]))
+            notes.append(self.STATUS_NOTES.get(insights["session_status"], insights["session_status"]))
         
         if insights["has_results"]:
             notes.append("download available")
@@ -578,30 +727,22 @@ Output strictly in JSON format."""
         else:
             response = self.fallback_responses["default"]
         
+        ts = datetime.now().isoformat()
+        
         # Record
-        self.conversation_history.append({
-            "timestamp": datetime.now().isoformat(),
-            "role": "assistant",
-            "content": response
-        })
+        self._record_turn("assistant", response, ts)
         
         return {
             "response": response,
             "intent": intent,
             "action": self._suggest_action(insights),
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": ts,
             "augmented": False
         }
     
     def execute_action(self, action: str, session_id: Optional[str] = None) -> Dict:
         """Execute suggested action (called by frontend if needed)"""
-        actions = {
-            "show_download": {"type": "navigate", "target": "results"},
-            "show_status": {"type": "display", "target": "session_info"},
-            "show_diagnostics": {"type": "display", "target": "error_details"},
-            "trigger_consolidate": {"type": "action", "target": "consolidate"}
-        }
-        return actions.get(action, {"type": "none"})
+        return dict(self.FRONTEND_ACTIONS.get(action, {"type": "none"}))
     
     # ==================== AGENTIC DATA MANIPULATION ====================
     
@@ -613,8 +754,16 @@ Output strictly in JSON format."""
         message_lower = message.lower()
         actions = []
         
+        # Most chat messages ask for nothing - skip the per-action checks
+        if not self._data_request_gate.search(message_lower):
+            return {"understood": message, "actions": actions, "execute": False}
+        
+        requested = {action for action, pattern in self._data_request_patterns.items()
+                     if pattern.search(message_lower)}
+        score_col = self._find_score_column_in_request(message_lower)
+        
         # Pattern matching for common requests
-        if any(kw in message_lower for kw in ["random score", "randomly score", "generate score"]):
+        if "add_random_scores" in requested:
             column_name = "Random_Score"
             # Try to extract custom column name
             if "column" in message_lower and "called" in message_lower:
@@ -627,19 +776,16 @@ Output strictly in JSON format."""
                 "params": {"column_name": column_name, "min_score": 0, "max_score": 100}
             })
         
-        if any(kw in message_lower for kw in ["add grade", "letter grade", "grade them"]):
+        if "add_grades" in requested:
             # Need to find score column - will use last added or specified
-            score_col = self._find_score_column_in_request(message)
             actions.append({
                 "action": "add_grades",
                 "params": {"score_column": score_col, "grade_column": "Grade"}
             })
         
-        if any(kw in message_lower for kw in ["pass fail", "passed failed", "pass or fail"]):
-            score_col = self._find_score_column_in_request(message)
+        if "add_pass_fail" in requested:
             threshold = 60
             # Try to extract threshold
-            import re
             threshold_match = re.search(r'threshold[:\s]+(\d+)', message_lower)
             if threshold_match:
                 threshold = int(threshold_match.group(1))
@@ -649,28 +795,26 @@ Output strictly in JSON format."""
                 "params": {"score_column": score_col, "result_column": "Status", "threshold": threshold}
             })
         
-        if any(kw in message_lower for kw in ["collate", "sum score", "total score", "average"]):
+        if "collate_scores" in requested:
             method = "average" if "average" in message_lower else "sum"
             actions.append({
                 "action": "collate_scores",
                 "params": {"method": method, "result_column": "Total_Score"}
             })
         
-        if any(kw in message_lower for kw in ["add rank", "ranking", "rank them"]):
-            score_col = self._find_score_column_in_request(message)
+        if "add_rank" in requested:
             actions.append({
                 "action": "add_rank",
                 "params": {"score_column": score_col, "rank_column": "Rank"}
             })
         
-        if any(kw in message_lower for kw in ["calculate bonus", "apply bonus", "participation bonus"]):
-            score_col = self._find_score_column_in_request(message)
+        if "calculate_bonus" in requested:
             actions.append({
                 "action": "calculate_bonus",
                 "params": {"score_column": score_col}
             })
         
-        if "sort" in message_lower or "order by" in message_lower:
+        if "sort_data" in requested:
             col = self._find_column_in_request(message)
             ascending = "descending" not in message_lower and "highest" not in message_lower
             actions.append({
@@ -684,10 +828,8 @@ Output strictly in JSON format."""
             "execute": len(actions) > 0
         }
     
-    def _find_score_column_in_request(self, message: str) -> str:
-        """Try to identify which score column the user is referring to"""
-        message_lower = message.lower()
-        
+    def _find_score_column_in_request(self, message_lower: str) -> str:
+        """Try to identify which score column the (lowercased) request refers to"""
         # Common patterns
         if "random" in message_lower:
             return "Random_Score"
@@ -773,7 +915,8 @@ Output strictly in JSON format."""
     
     def clear_history(self):
         """Clear conversation history"""
-        self.conversation_history = []
+        self.conversation_history.clear()
+        self._llm_messages.clear()
         self.session_context = {}
     
     def get_health_report(self) -> Dict:
@@ -820,16 +963,8 @@ Output strictly in JSON format."""
                 "suggestion": "Set GROQ_API_KEY environment variable"
             })
         
-        # Check 2: Memory usage (conversation history)
+        # Check 2: Memory usage (conversation history is capped at MAX_HISTORY)
         diagnosis["checks"].append("memory_usage")
-        if len(self.conversation_history) > 1000:
-            old_count = len(self.conversation_history)
-            self.conversation_history = self.conversation_history[-500:]
-            diagnosis["auto_fixes_applied"].append({
-                "action": "trimmed_conversation_history",
-                "before": old_count,
-                "after": len(self.conversation_history)
-            })
         
         # Check 3: Self-healing engine
         diagnosis["checks"].append("self_healing_engine")
@@ -57,6 +57,7 @@ class Settings(BaseSettings):
     TELEGRAM_BOT_TOKEN: Optional[str] = None
     MLJCM_BOT_TOKEN: Optional[str] = None
     WEBHOOK_BASE_URL: Optional[str] = None
+    WEBHOOK_SECRET: Optional[str] = None
     
     # Groq AI (OPTIONAL - set to enable AI features)
     GROQ_API_KEY: Optional[str] = None
@@ -182,6 +183,9 @@ def validate_settings():
     if s.ENABLE_TELEGRAM_BOT and not s.WEBHOOK_BASE_URL:
         warnings.append("WEBHOOK_BASE_URL not set - bot will use polling mode (this is fine)")
     
+    if s.ENABLE_TELEGRAM_BOT and s.WEBHOOK_BASE_URL and not s.WEBHOOK_SECRET:
+        errors.append("WEBHOOK_SECRET not set but WEBHOOK_BASE_URL enables webhook mode")
+    
     if s.ENABLE_AI_ASSISTANT and not s.GROQ_API_KEY:
         errors.append("GROQ_API_KEY not set but AI enabled")
     
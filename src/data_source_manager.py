@@ -17,6 +17,8 @@ import feedparser
 
 logger = logging.getLogger(__name__)
 
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=30)
+
 
 @dataclass
 class DataSource:
@@ -50,18 +52,21 @@ class DataSourceConnector(ABC):
     def __init__(self, source: DataSource):
         self.source = source
         self.session: Optional[aiohttp.ClientSession] = None
+        self._owns_session = False
         self.cache: Dict[str, DataRecord] = {}
         self.cache_ttl = 300  # 5 minutes
     
-    async def connect(self) -> bool:
-        """Initialize connection"""
-        self.session = aiohttp.ClientSession()
+    async def connect(self, session: Optional[aiohttp.ClientSession] = None) -> bool:
+        """Initialize connection, reusing a shared session when one is given"""
+        self._owns_session = session is None
+        self.session = session or aiohttp.ClientSession(timeout=HTTP_TIMEOUT)
         return True
     
     async def disconnect(self):
-        """Close connection"""
-        if self.session:
+        """Close connection (a shared session is closed by its owner)"""
+        if self.session and self._owns_session:
             await self.session.close()
+        self.session = None
     
     @abstractmethod
     async def fetch(self) -> List[DataRecord]:
@@ -258,6 +263,20 @@ class DataSourceManager:
         self.sources: Dict[str, DataSource] = {}
         self.connectors: Dict[str, DataSourceConnector] = {}
         self.last_refresh: Dict[str, datetime] = {}
+        self.session: Optional[aiohttp.ClientSession] = None
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Shared HTTP session so every connector reuses one connection pool"""
+        if self.session is None or self.session.closed:
+            # Small bounded pool; cached DNS saves a getaddrinfo per refresh
+            connector = aiohttp.TCPConnector(
+                limit=20,
+                limit_per_host=4,
+                ttl_dns_cache=300,
+                keepalive_timeout=60,
+            )
+            self.session = aiohttp.ClientSession(connector=connector, timeout=HTTP_TIMEOUT)
+        return self.session
     
     def register_source(self, source: DataSource) -> bool:
         """Register a new data source"""
@@ -299,7 +318,7 @@ class DataSourceManager:
                 return []
         
         if not connector.session:
-            await connector.connect()
+            await connector.connect(self._get_session())
         
         records = await connector.fetch()
         self.last_refresh[source_id] = datetime.now()
@@ -323,6 +342,9 @@ class DataSourceManager:
         """Close all connections"""
         for connector in self.connectors.values():
             await connector.disconnect()
+        if self.session:
+            await self.session.close()
+            self.session = None
 
 
 # Global manager instance
@@ -6,7 +6,7 @@ Includes AI Assistant for conversational analysis
 """
 
 from fastapi import APIRouter, File, UploadFile, Query, HTTPException, BackgroundTasks, Request
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
 import os
 import json
 import uuid
@@ -27,7 +27,8 @@ router = APIRouter(prefix="/api/hybrid", tags=["hybrid"])
 # Persistent session storage
 db = get_session_db()
 SESSION_TIMEOUT = 3600  # 1 hour
-LAST_ACTIVITY = datetime.now()  # Track last API activity
+STARTED_AT = datetime.now()  # Process start, for uptime_seconds
+LAST_ACTIVITY = STARTED_AT  # Track last API activity
 
 session_manager = SessionManager()
 
@@ -43,11 +44,15 @@ def record_activity():
 @router.get("/keepalive")
 async def keepalive():
     """Keepalive endpoint - ping this regularly to prevent hibernation"""
-    record_activity()
+    global LAST_ACTIVITY
+    now = datetime.now()
+    idle_seconds = (now - LAST_ACTIVITY).total_seconds()
+    LAST_ACTIVITY = now
     return {
         "status": "alive",
-        "timestamp": datetime.now().isoformat(),
-        "uptime_seconds": (datetime.now() - LAST_ACTIVITY).total_seconds()
+        "timestamp": now.isoformat(),
+        "uptime_seconds": (now - STARTED_AT).total_seconds(),
+        "idle_seconds": idle_seconds
     }
 
 @router.post("/session/create")
@@ -299,6 +304,18 @@ async def execute_data_transformations(session_id: str, actions: list) -> dict:
         logging.error(f"Data transformation error: {e}")
         return {"success": False, "error": str(e)}
 
+def build_assistant_context(session_id: str, session: dict) -> dict:
+    """Session context the assistant uses for awareness (empty if no session)"""
+    if not session:
+        return {}
+    result = db.get_consolidation_result(session_id)
+    return {
+        "files_count": len(db.get_uploads(session_id)),
+        "status": session.get("status"),
+        "has_results": result is not None,
+        "error": session.get("error")
+    }
+
 @router.post("/ai-assist")
 async def ai_assist(request: Request):
     """Augmented Intelligence endpoint - context-aware assistance"""
@@ -313,16 +330,8 @@ async def ai_assist(request: Request):
             return {"error": "No message provided"}
         
         # Build session context for awareness
-        context = {}
         session = db.get_session(session_id) if session_id else None
-        if session:
-            result = db.get_consolidation_result(session_id)
-            context = {
-                "files_count": len(db.get_uploads(session_id)),
-                "status": session.get("status"),
-                "has_results": result is not None,
-                "error": session.get("error")
-            }
+        context = build_assistant_context(session_id, session)
         
         # Get assistant with context
         from src.ai_assistant import get_assistant
@@ -401,6 +410,33 @@ async def ai_assist(request: Request):
             "trace": traceback.format_exc()
         }
 
+@router.post("/ai-assist/stream")
+async def ai_assist_stream(request: Request):
+    """
+    Streaming variant of /ai-assist for conversational replies.
+    Sends Server-Sent Events: one {"delta": ...} per chunk, then [DONE].
+    """
+    record_activity()
+    
+    body = await request.json()
+    message = body.get('message', '')
+    session_id = body.get('session_id')
+    
+    if not message:
+        return {"error": "No message provided"}
+    
+    session = db.get_session(session_id) if session_id else None
+    context = build_assistant_context(session_id, session)
+    assistant = get_assistant()
+    
+    def events():
+        for chunk in assistant.stream_response(message, session_id, context):
+            yield f"data: {json.dumps({'delta': chunk})}\n\n"
+        yield "data: [DONE]\n\n"
+    
+    # Starlette iterates the sync generator in its thread pool
+    return StreamingResponse(events(), media_type="text/event-stream")
+
 @router.post("/ai-mode")
 async def set_ai_mode(request: Request):
     """Switch AI assistant mode (consolidation / cold_email)"""
@@ -8,15 +8,27 @@ Replaces: server.py (merged here)
 """
 
 import asyncio
+import hmac
 import logging
 import signal
+import sys
 import threading
 import os
+from collections import deque
+import random
 from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI
+import orjson
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
+
+try:
+    # C-implemented lock, cheaper on the uncontended startup path
+    from fastrlock.rlock import FastRLock
+except ImportError:
+    FastRLock = threading.RLock
 
 from src.config import get_settings, validate_settings
 from src.session_storage import get_session_db
@@ -24,206 +36,484 @@ from src.async_ai_service import initialize_async_ai, shutdown_async_ai
 from src.async_data_agent import initialize_async_data_agent, shutdown_async_data_agent
 from src.async_file_io import initialize_async_file_io, shutdown_async_file_io
 
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+class RingBufferHandler(logging.Handler):
+    """Keep the most recent formatted log lines in memory so /logs never touches disk"""
+
+    def __init__(self, capacity: int = 500):
+        super().__init__()
+        self.buffer = deque(maxlen=capacity)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.buffer.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    format=LOG_FORMAT
 )
+# Reuse an already-installed buffer if this module is imported a second
+# time (e.g. as both __main__ and src.main) so records are not captured twice
+LOG_BUFFER_NAME = "mlj_ring_buffer"
+log_buffer = next(
+    (h for h in logging.getLogger().handlers if h.get_name() == LOG_BUFFER_NAME),
+    None,
+)
+if log_buffer is None:
+    log_buffer = RingBufferHandler()
+    log_buffer.set_name(LOG_BUFFER_NAME)
+    log_buffer.setFormatter(logging.Formatter(LOG_FORMAT))
+    logging.getLogger().addHandler(log_buffer)
 logger = logging.getLogger(__name__)
 
-# Global bot thread and state
-bot_thread = None
-bot_lock = threading.Lock()
-bot_initialized = False
+
+class _QuietAccessFilter(logging.Filter):
+    """Drop uvicorn access records for health/root probes and Telegram webhook pushes"""
+
+    QUIET_PATHS = frozenset({"/health", "/", "/webhook"})
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # uvicorn.access args: (client_addr, method, full_path, http_version, status_code)
+        args = record.args
+        if isinstance(args, tuple) and len(args) >= 3:
+            return args[2].split("?", 1)[0] not in self.QUIET_PATHS
+        return True
+
+
+_access_logger = logging.getLogger("uvicorn.access")
+if not any(type(f).__name__ == _QuietAccessFilter.__name__ for f in _access_logger.filters):
+    _access_logger.addFilter(_QuietAccessFilter())
+
+# Primary bot polling task (polling mode, runs on the FastAPI event loop)
+bot_task = None
+
+# Primary bot application (webhook mode, runs on the FastAPI event loop)
+bot_application = None
+bot_update_types = frozenset()
 
 # Content Manager bot thread and state
 cm_bot_thread = None
-cm_bot_lock = threading.Lock()
+cm_bot_lock = FastRLock()
 cm_bot_initialized = False
 
 is_shutting_down = False
 
+# Telegram-side long-poll window: an idle bot makes one getUpdates call per window
+BOT_POLL_TIMEOUT = 25
 
-def start_bot_thread():
-    global bot_thread, bot_initialized
+# Persisted polling offsets, one file per bot id
+BOT_STATE_DIR = Path("data")
 
-    
-    settings = get_settings()
-    if not settings.ENABLE_TELEGRAM_BOT:
-        logger.info("Telegram bot disabled (ENABLE_TELEGRAM_BOT=false)")
+# Max chats whose updates are processed at once (polling batches and webhook tasks)
+BOT_UPDATE_CONCURRENCY = 8
+
+# Minimum wait after a getUpdates Conflict: each retry rebuilds the app
+# (getMe + deleteWebhook), and the other poller needs time to go away
+CONFLICT_MIN_DELAY = 10
+
+# set_webhook attempts at startup before falling back to polling
+WEBHOOK_SETUP_ATTEMPTS = 5
+
+# In-flight webhook update tasks (awaited on shutdown) and the latest task per chat
+webhook_tasks = set()
+webhook_chat_tails = {}
+webhook_semaphore = asyncio.Semaphore(BOT_UPDATE_CONCURRENCY)
+
+# Cached read-only descriptors for /logs: path -> (fd, inode)
+_log_fds = {}
+
+
+def _tail_log(path: str, lines: int, block_size: int = 8192):
+    """
+    Return the last `lines` lines of an append-only log file, or None if it doesn't exist.
+    Keeps one descriptor open per path and tails it with pread; reopens after rotation.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        cached = _log_fds.pop(path, None)
+        if cached:
+            os.close(cached[0])
         return None
     
-    token = os.getenv('TELEGRAM_BOT_TOKEN')
-    if not token:
-        logger.warning("TELEGRAM_BOT_TOKEN not set, bot will not start")
-        return None
+    cached = _log_fds.get(path)
+    if cached is None or cached[1] != st.st_ino:
+        if cached:
+            os.close(cached[0])
+        cached = (os.open(path, os.O_RDONLY), st.st_ino)
+        _log_fds[path] = cached
+    fd = cached[0]
+    
+    # Read backwards in blocks until we have enough newlines
+    pos = st.st_size
+    data = b""
+    while pos > 0 and data.count(b"\n") <= lines:
+        read_size = min(block_size, pos)
+        pos -= read_size
+        data = os.pread(fd, read_size, pos) + data
     
-    with bot_lock:
-        if bot_initialized and bot_thread and bot_thread.is_alive():
-            logger.warning("Bot already running, skipping duplicate")
-            return bot_thread
-        bot_initialized = True
+    tail = data.decode("utf-8", errors="ignore").splitlines(keepends=True)
+    return "".join(tail[-lines:]) if lines > 0 else ""
+
+
+async def dispatch_update_batch(application, updates, concurrency: int = BOT_UPDATE_CONCURRENCY):
+    """
+    Process a batch of updates concurrently so one slow handler doesn't stall the rest.
+    Updates from the same chat are processed in order, since ConversationHandler
+    state must not be raced.
+    """
+    by_chat = {}
+    for update in updates:
+        chat = update.effective_chat
+        by_chat.setdefault(chat.id if chat else None, []).append(update)
     
-    def bot_worker():
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def process_chat(chat_updates):
+        async with semaphore:
+            for update in chat_updates:
+                await application.process_update(update)
+    
+    async with asyncio.TaskGroup() as tg:
+        for chat_updates in by_chat.values():
+            tg.create_task(process_chat(chat_updates))
+
+
+def _load_bot_offset(path: Path) -> int:
+    """Read the persisted getUpdates offset (0 if none)"""
+    try:
+        return int(path.read_text())
+    except (OSError, ValueError):
+        return 0
+
+
+def _save_bot_offset(path: Path, offset: int):
+    """Persist the getUpdates offset so a restart resumes without re-processing a batch"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(str(offset))
+    except OSError as e:
+        logger.warning(f"Failed to persist bot offset: {e}")
+
+
+async def poll_updates(application, allowed_updates=None, on_success=None):
+    """
+    Fetch updates with getUpdates until shutdown, dispatching each batch concurrently.
+    Transient errors are retried in place, like PTB's Updater: timeouts at once,
+    RetryAfter after the requested wait, other network errors with backoff.
+    Anything else (Conflict, InvalidToken, ...) propagates to the caller's retry loop.
+    on_success is called after every successful getUpdates.
+    """
+    from telegram.error import NetworkError, RetryAfter, TimedOut
+    
+    offset_file = BOT_STATE_DIR / f"offset_{application.bot.id}"
+    offset = _load_bot_offset(offset_file)
+    error_count = 0
+    while not is_shutting_down:
         try:
-            from dotenv import load_dotenv
+            updates = await application.bot.get_updates(
+                offset=offset,
+                timeout=BOT_POLL_TIMEOUT,
+                read_timeout=5,  # PTB adds the long-poll timeout on top of this
+                allowed_updates=allowed_updates,
+            )
+        except TimedOut:
+            continue
+        except RetryAfter as e:
+            logger.warning(f"getUpdates flood control, retrying in {e.retry_after}s")
+            await asyncio.sleep(e.retry_after)
+            continue
+        except NetworkError as e:
+            error_count += 1
+            logger.warning(f"getUpdates network error #{error_count}: {e}")
+            await _backoff(error_count, cap=30)
+            continue
+        
+        error_count = 0
+        if on_success:
+            on_success()
+        if not updates:
+            continue
+        # The next getUpdates acknowledges the whole batch; the slowest handler doesn't hold back the offset
+        offset = updates[-1].update_id + 1
+        await dispatch_update_batch(application, updates)
+        # Persist only once the batch is handled, so a restart mid-batch fetches it again
+        await asyncio.to_thread(_save_bot_offset, offset_file, offset)
+
+
+async def _backoff(retry_count: int, base: float = 1.3, cap: float = 30, floor: float = 0) -> float:
+    """
+    Sleep for a jittered exponential backoff before the next retry.
+    A low base keeps recovery from short outages fast; floor sets a minimum
+    wait for errors where retrying quickly only repeats the failure.
+    """
+    delay = max(min(0.5 * base ** retry_count, cap) * random.uniform(0.5, 1.5), floor)
+    await asyncio.sleep(delay)
+    return delay
+
+
+async def _stop_application(application):
+    """Best-effort stop of a (possibly half-started) PTB application"""
+    try:
+        if application.updater and application.updater.running:
+            await application.updater.stop()
+        if application.running:
+            await application.stop()
+        await application.shutdown()
+    except Exception:
+        pass
+
+
+async def run_bot_with_retry(token: str) -> bool:
+    """
+    Poll for updates until shutdown, rebuilding the application on errors.
+    Returns True if the caller should restart after a cooldown.
+    """
+    from telegram.error import Conflict, NetworkError, RetryAfter, TelegramError
+    from telegram_bot import ALLOWED_UPDATES, build_application
+    
+    retry_count = 0
+    max_retries = 30
+    
+    def reset_retries():
+        nonlocal retry_count
+        retry_count = 0
+    
+    while retry_count < max_retries:
+        application = None
+        try:
+            application = build_application(token)
+            await application.initialize()
+            logger.info("Bot initialized")
             
-            logger.info("Initializing Telegram bot in background thread...")
+            try:
+                await application.bot.delete_webhook(drop_pending_updates=False)
+            except Exception:
+                pass
             
-            load_dotenv(dotenv_path='.env')
+            logger.info("Starting bot polling...")
+            await application.start()
+            logger.info("Bot is now polling for updates")
             
-
-            try:
-                from telegram_bot import build_application
-                from telegram import Update
-                from telegram.error import Conflict, NetworkError, TelegramError
-            except Exception as e:
-                logger.error(f"Failed to import telegram_bot: {e}", exc_info=True)
-                return
+            await poll_updates(application, allowed_updates=list(ALLOWED_UPDATES), on_success=reset_retries)
             
-            token = os.getenv('TELEGRAM_BOT_TOKEN')
-            if not token:
-                logger.error("TELEGRAM_BOT_TOKEN not available in bot thread")
-                return
+            logger.info("Shutting down bot gracefully...")
+            await application.stop()
+            await application.shutdown()
+            return False
+        
+        except asyncio.CancelledError:
+            logger.info("Bot polling cancelled, shutting down...")
+            if application:
+                await _stop_application(application)
+            raise
             
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+        except Conflict as e:
+            retry_count += 1
+            logger.error(f"Bot conflict #{retry_count}/{max_retries}: {e}")
             
-            async def run_bot_with_retry():
-                retry_count = 0
-                max_retries = 30
-                
-                while retry_count < max_retries:
-                    application = None
-                    try:
-                        application = build_application(token)
-                        await application.initialize()
-                        logger.info("Bot initialized")
-                        
-                        try:
-                            await application.bot.delete_webhook(drop_pending_updates=True)
-                        except Exception:
-                            pass
-                        
-                        logger.info("Starting bot polling...")
-                        await application.start()
-                        await application.updater.start_polling(
-                            allowed_updates=Update.ALL_TYPES,
-                            drop_pending_updates=True
-                        )
-                        logger.info("Bot is now polling for updates")
-                        
-                        stop_event = asyncio.Event()
-                        
-                        async def check_shutdown():
-                            while not is_shutting_down and application.updater and application.updater.running:
-                                await asyncio.sleep(1)
-                            stop_event.set()
-                            
-                        asyncio.create_task(check_shutdown())
-                        await stop_event.wait()
-                            
-                        if is_shutting_down:
-                            logger.info("Shutting down bot gracefully...")
-                            await application.updater.stop()
-                            await application.stop()
-                            await application.shutdown()
-                            return False
-                        else:
-                            logger.warning("Bot polling stopped unexpectedly. Preparing to restart...")
-                            try:
-                                await application.updater.stop()
-                                await application.stop()
-                                await application.shutdown()
-                            except Exception:
-                                pass
-                            
-                            await asyncio.sleep(10)
-                            return True
-                        
-                    except Conflict as e:
-                        retry_count += 1
-                        wait_time = 30 if retry_count <= 3 else min(5 ** min(retry_count - 3, 4), 120)
-                        logger.error(f"Bot conflict #{retry_count}/{max_retries}: {e}")
-                        
-                        if application:
-                            try:
-                                if application.updater and application.updater.running:
-                                    await application.updater.stop()
-                                if application.running:
-                                    await application.stop()
-                                await application.shutdown()
-                            except:
-                                pass
-                        
-                        await asyncio.sleep(wait_time)
-                    
-                    except (TelegramError, NetworkError) as e:
-                        retry_count += 1
-                        wait_time = min(2 ** retry_count, 60)
-                        logger.warning(f"Bot network error #{retry_count}: {e}")
-                        
-                        if application:
-                            try:
-                                if application.updater and application.updater.running:
-                                    await application.updater.stop()
-                                if application.running:
-                                    await application.stop()
-                                await application.shutdown()
-                            except:
-                                pass
-                        
-                        await asyncio.sleep(wait_time)
-                    
-                    except Exception as e:
-                        retry_count += 1
-                        logger.error(f"Bot error #{retry_count}: {e}", exc_info=True)
-                        
-                        if application:
-                            try:
-                                if application.updater and application.updater.running:
-                                    await application.updater.stop()
-                                if application.running:
-                                    await application.stop()
-                                await application.shutdown()
-                            except:
-                                pass
-                        
-                        await asyncio.sleep(10)
-                
-                logger.error(f"Bot max retries ({max_retries}) exceeded")
-                return True
+            if application:
+                await _stop_application(application)
             
-            async def run_bot_forever():
-                restart_count = 0
-                while True:
-                    should_restart = await run_bot_with_retry()
-                    if not should_restart:
-                        break
-                    
-                    restart_count += 1
-                    cooldown = min(60 * restart_count, 300)
-                    logger.warning(f"Bot restart #{restart_count} — cooling down {cooldown}s before retry cycle...")
-                    await asyncio.sleep(cooldown)
+            await _backoff(retry_count, floor=CONFLICT_MIN_DELAY)
+        
+        except RetryAfter as e:
+            retry_count += 1
+            logger.warning(f"Bot flood control #{retry_count}, retrying in {e.retry_after}s")
             
-            try:
-                loop.run_until_complete(run_bot_forever())
-            except Exception as e:
-                logger.error(f"Fatal bot error: {e}", exc_info=True)
-            finally:
-                loop.close()
+            if application:
+                await _stop_application(application)
+            
+            await asyncio.sleep(e.retry_after)
+        
+        except (TelegramError, NetworkError) as e:
+            retry_count += 1
+            logger.warning(f"Bot network error #{retry_count}: {e}")
+            
+            if application:
+                await _stop_application(application)
+            
+            await _backoff(retry_count, cap=60)
         
         except Exception as e:
-            logger.error(f"Bot thread fatal error: {e}", exc_info=True)
-        finally:
-            global bot_initialized
-            with bot_lock:
-                bot_initialized = False
+            retry_count += 1
+            logger.error(f"Bot error #{retry_count}: {e}", exc_info=True)
+            
+            if application:
+                await _stop_application(application)
+            
+            await _backoff(retry_count, cap=60)
+    
+    logger.error(f"Bot max retries ({max_retries}) exceeded")
+    return True
+
+
+async def run_bot_forever(token: str):
+    """Keep the polling bot alive across retry cycles"""
+    restart_count = 0
+    while True:
+        should_restart = await run_bot_with_retry(token)
+        if not should_restart:
+            break
+        
+        restart_count += 1
+        cooldown = min(60 * restart_count, 300)
+        logger.warning(f"Bot restart #{restart_count} — cooling down {cooldown}s before retry cycle...")
+        await asyncio.sleep(cooldown)
+
+
+def start_bot_polling():
+    """
+    Schedule the polling bot as a task on the running event loop.
+    PTB is fully async, so it shares the FastAPI loop instead of owning a thread.
+    """
+    global bot_task
+    
+    settings = get_settings()
+    if not settings.ENABLE_TELEGRAM_BOT:
+        logger.info("Telegram bot disabled (ENABLE_TELEGRAM_BOT=false)")
+        return None
+    
+    token = settings.TELEGRAM_BOT_TOKEN or os.getenv('TELEGRAM_BOT_TOKEN')
+    if not token:
+        logger.warning("TELEGRAM_BOT_TOKEN not set, bot will not start")
+        return None
+    
+    if bot_task and not bot_task.done():
+        logger.warning("Bot already running, skipping duplicate")
+        return bot_task
+    
+    bot_task = asyncio.create_task(run_bot_forever(token), name="telegram-bot-polling")
+    logger.info("Bot polling task started")
+    return bot_task
+
+
+async def stop_bot_polling():
+    """Cancel the polling task and wait for the application to shut down"""
+    global bot_task
+    
+    task = bot_task
+    if task is None:
+        return
+    bot_task = None
+    
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
+async def start_bot_webhook():
+    """
+    Start the primary bot in webhook mode on the current event loop.
+    Telegram pushes updates to POST /webhook; no polling thread is needed.
+    """
+    global bot_application, bot_update_types
     
-    thread = threading.Thread(target=bot_worker, daemon=True)
-    thread.start()
-    logger.info("Bot thread started")
-    return thread
+    settings = get_settings()
+    token = settings.TELEGRAM_BOT_TOKEN or os.getenv('TELEGRAM_BOT_TOKEN')
+    
+    from telegram.error import RetryAfter, TelegramError
+    from telegram_bot import ALLOWED_UPDATES, build_application
+    
+    application = build_application(token)
+    try:
+        await application.initialize()
+        await application.start()
+        
+        webhook_url = f"{settings.WEBHOOK_BASE_URL.rstrip('/')}/webhook"
+        for attempt in range(1, WEBHOOK_SETUP_ATTEMPTS + 1):
+            try:
+                await application.bot.set_webhook(
+                    url=webhook_url,
+                    allowed_updates=list(ALLOWED_UPDATES),
+                    secret_token=settings.WEBHOOK_SECRET,
+                )
+                break
+            except TelegramError as e:
+                if attempt == WEBHOOK_SETUP_ATTEMPTS:
+                    raise
+                logger.warning(f"set_webhook attempt {attempt}/{WEBHOOK_SETUP_ATTEMPTS} failed: {e}")
+                if isinstance(e, RetryAfter):
+                    await asyncio.sleep(e.retry_after)
+                else:
+                    await _backoff(attempt)
+    except BaseException:
+        await _stop_application(application)
+        raise
+    
+    bot_update_types = frozenset(ALLOWED_UPDATES)
+    bot_application = application
+    logger.info("Bot webhook registered")
+    return application
+
+
+async def _process_webhook_update(application, update, previous):
+    """Process one webhook update after the previous update from the same chat has finished"""
+    if previous is not None:
+        await asyncio.wait([previous])
+    async with webhook_semaphore:
+        await application.process_update(update)
+
+
+def schedule_webhook_update(application, update):
+    """
+    Process a webhook update in the background so Telegram is acked immediately.
+    Updates from the same chat are chained to keep ConversationHandler state ordered.
+    """
+    chat = update.effective_chat
+    chat_id = chat.id if chat else None
+    previous = webhook_chat_tails.get(chat_id) if chat_id is not None else None
+    
+    task = asyncio.create_task(_process_webhook_update(application, update, previous))
+    webhook_tasks.add(task)
+    
+    def on_done(t):
+        webhook_tasks.discard(t)
+        if webhook_chat_tails.get(chat_id) is t:
+            del webhook_chat_tails[chat_id]
+        if not t.cancelled() and t.exception() is not None:
+            logger.error(f"Webhook update failed: {t.exception()}")
+    
+    if chat_id is not None:
+        webhook_chat_tails[chat_id] = task
+    task.add_done_callback(on_done)
+    return task
+
+
+async def stop_bot_webhook():
+    """Remove the webhook and stop the webhook-mode bot"""
+    global bot_application
+    
+    application = bot_application
+    if application is None:
+        return
+    bot_application = None
+    
+    if webhook_tasks:
+        logger.info(f"Waiting for {len(webhook_tasks)} in-flight webhook updates...")
+        await asyncio.gather(*webhook_tasks, return_exceptions=True)
+    
+    try:
+        await application.bot.delete_webhook()
+    except Exception as e:
+        logger.warning(f"Failed to delete webhook: {e}")
+    await application.stop()
+    await application.shutdown()
+
+
+def primary_bot_alive() -> bool:
+    """True if the primary bot is serving updates (webhook app running or polling task alive)"""
+    if bot_application is not None:
+        return bot_application.running
+    return bool(bot_task and not bot_task.done())
 
 
 def start_cm_bot_thread():
@@ -267,7 +557,7 @@ def start_cm_bot_thread():
             asyncio.set_event_loop(loop)
             
             async def run_cm_bot_with_retry():
-                from telegram.error import Conflict, NetworkError, TelegramError
+                from telegram.error import Conflict, NetworkError, RetryAfter, TelegramError
                 retry_count = 0
                 max_retries = 30
                 
@@ -312,7 +602,6 @@ def start_cm_bot_thread():
                         
                     except Conflict as e:
                         retry_count += 1
-                        wait_time = 30 if retry_count <= 3 else min(5 ** min(retry_count - 3, 4), 120)
                         logger.error(f"MLJCM conflict #{retry_count}: {e}")
                         
                         if cm_bot:
@@ -320,18 +609,27 @@ def start_cm_bot_thread():
                                 await cm_bot.shutdown()
                             except:
                                 pass
-                        await asyncio.sleep(wait_time)
+                        await _backoff(retry_count, floor=CONFLICT_MIN_DELAY)
+                        
+                    except RetryAfter as e:
+                        retry_count += 1
+                        logger.warning(f"MLJCM flood control #{retry_count}, retrying in {e.retry_after}s")
+                        if cm_bot:
+                            try:
+                                await cm_bot.shutdown()
+                            except:
+                                pass
+                        await asyncio.sleep(e.retry_after)
                         
                     except (TelegramError, NetworkError) as e:
                         retry_count += 1
-                        wait_time = min(2 ** retry_count, 60)
                         logger.warning(f"MLJCM network error #{retry_count}: {e}")
                         if cm_bot:
                             try:
                                 await cm_bot.shutdown()
                             except:
                                 pass
-                        await asyncio.sleep(wait_time)
+                        await _backoff(retry_count, cap=60)
                         
                     except Exception as e:
                         retry_count += 1
@@ -341,7 +639,7 @@ def start_cm_bot_thread():
                                 await cm_bot.shutdown()
                             except:
                                 pass
-                        await asyncio.sleep(10)
+                        await _backoff(retry_count, cap=60)
                         
                 logger.error("MLJCM max retries exceeded")
                 return True
@@ -384,7 +682,7 @@ async def lifespan(app: FastAPI):
     Application lifecycle management.
     Handles startup and graceful shutdown.
     """
-    global bot_thread, cm_bot_thread, is_shutting_down
+    global cm_bot_thread, is_shutting_down
     
     # STARTUP
     logger.info("=" * 60)
@@ -420,9 +718,16 @@ async def lifespan(app: FastAPI):
         await initialize_async_file_io()
         logger.info("✓ Async services initialized")
         
-        # Start Telegram bot (if enabled)
+        # Start Telegram bot (if enabled): webhook mode when a public URL is configured
         logger.info("Starting Telegram bot (if enabled)...")
-        bot_thread = start_bot_thread()
+        if settings.ENABLE_TELEGRAM_BOT and settings.WEBHOOK_BASE_URL:
+            try:
+                await start_bot_webhook()
+            except Exception as e:
+                logger.error(f"Failed to start bot in webhook mode, falling back to polling: {e}", exc_info=True)
+                start_bot_polling()
+        else:
+            start_bot_polling()
         
         # Start MLJCM bot (if token provided)
         logger.info("Starting MLJCM bot (if token provided)...")
@@ -451,13 +756,20 @@ async def lifespan(app: FastAPI):
     
     is_shutting_down = True
     
-    if bot_thread and bot_thread.is_alive():
-        logger.info("Waiting for bottom primary thread to stop...")
-        bot_thread.join(timeout=3)
+    try:
+        await stop_bot_webhook()
+    except Exception as e:
+        logger.warning(f"Bot webhook shutdown error: {e}")
+    
+    try:
+        await stop_bot_polling()
+    except Exception as e:
+        logger.warning(f"Bot polling shutdown error: {e}")
         
     if cm_bot_thread and cm_bot_thread.is_alive():
         logger.info("Waiting for cm bot thread to stop...")
-        cm_bot_thread.join(timeout=3)
+        # Join off the event loop so in-flight requests aren't stalled during shutdown
+        await asyncio.to_thread(cm_bot_thread.join, 3)
     
     try:
         # Cleanup async services
@@ -501,7 +813,8 @@ def create_app() -> FastAPI:
         title=settings.APP_NAME,
         version=settings.APP_VERSION,
         description="Excel consolidation and grading system with Telegram bot",
-        lifespan=lifespan
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
     
     # Add CORS middleware
@@ -514,6 +827,16 @@ def create_app() -> FastAPI:
     )
     
     # Health check endpoint
+    # Config-derived fields never change for the life of the app, so build them once
+    health_static = {
+        "version": settings.APP_VERSION,
+        "environment": settings.ENV,
+        "ai_enabled": settings.ENABLE_AI_ASSISTANT,
+        "bot_enabled": settings.ENABLE_TELEGRAM_BOT,
+        "cm_bot_enabled": bool(settings.MLJCM_BOT_TOKEN),
+    }
+    health_headers = {"Cache-Control": "no-store"}
+    
     @app.get("/health", tags=["health"])
     async def health_check():
         """Healthcheck endpoint for monitoring and load balancers"""
@@ -521,13 +844,11 @@ def create_app() -> FastAPI:
             db = get_session_db()
             stats = db.get_session_statistics()
             
-            # Check bot thread liveness
+            # Check bot liveness
             bot_status = "disabled"
             if settings.ENABLE_TELEGRAM_BOT:
-                if bot_thread and bot_thread.is_alive():
+                if primary_bot_alive():
                     bot_status = "running"
-                elif bot_initialized:
-                    bot_status = "starting"
                 else:
                     bot_status = "dead"
                     
@@ -536,38 +857,38 @@ def create_app() -> FastAPI:
             if settings.MLJCM_BOT_TOKEN:
                 if cm_bot_thread and cm_bot_thread.is_alive():
                     cm_bot_status = "running"
-                elif bot_initialized: # initialized generally tracks bot boot phase
+                elif cm_bot_initialized:
                     cm_bot_status = "starting"
                 else:
                     cm_bot_status = "dead"
             
             overall = "healthy" if (bot_status in ("running", "disabled") and cm_bot_status in ("running", "disabled")) else "degraded"
             
-            return {
+            body = orjson.dumps({
                 "status": overall,
-                "version": settings.APP_VERSION,
-                "environment": settings.ENV,
+                **health_static,
                 "database": "ok",
                 "sessions_active": stats["total_sessions"],
-                "ai_enabled": settings.ENABLE_AI_ASSISTANT,
-                "bot_enabled": settings.ENABLE_TELEGRAM_BOT,
                 "bot_status": bot_status,
-                "cm_bot_enabled": bool(settings.MLJCM_BOT_TOKEN),
                 "cm_bot_status": cm_bot_status,
-            }
+            })
+            return Response(content=body, media_type="application/json", headers=health_headers)
         except Exception as e:
             logger.error(f"Health check failed: {e}")
-            return {
+            body = orjson.dumps({
                 "status": "unhealthy",
                 "error": str(e),
                 "version": settings.APP_VERSION,
-            }, 503
+            })
+            return Response(content=body, status_code=503, media_type="application/json", headers=health_headers)
+    
+    # Ping endpoint for keepalive; the payload is constant, so serialize it once
+    ping_body = orjson.dumps({"status": "pong"})
     
-    # Ping endpoint for keepalive
     @app.get("/ping", tags=["ping"])
     async def ping():
         """Minimal ping endpoint for keepalive systems"""
-        return {"status": "pong"}
+        return Response(content=ping_body, media_type="application/json")
     
     # Bot health endpoint
     @app.get("/bot-health", tags=["health"])
@@ -576,8 +897,8 @@ def create_app() -> FastAPI:
         bot_info = {
             "primary_bot": {
                 "enabled": settings.ENABLE_TELEGRAM_BOT,
-                "thread_alive": bot_thread is not None and bot_thread.is_alive() if bot_thread else False,
-                "initialized": bot_initialized,
+                "task_alive": bool(bot_task and not bot_task.done()),
+                "webhook_mode": bot_application is not None,
                 "token_configured": bool(os.getenv("TELEGRAM_BOT_TOKEN")),
             },
             "mljcm_bot": {
@@ -590,20 +911,18 @@ def create_app() -> FastAPI:
         # Determine Primary status
         if not settings.ENABLE_TELEGRAM_BOT:
             bot_info["primary_bot"]["status"] = "disabled"
-        elif bot_thread and bot_thread.is_alive():
+        elif primary_bot_alive():
             bot_info["primary_bot"]["status"] = "healthy"
-        elif bot_initialized:
-            bot_info["primary_bot"]["status"] = "starting"
         else:
             bot_info["primary_bot"]["status"] = "dead"
-            bot_info["primary_bot"]["action"] = "Bot thread has exited. Redeploy or restart to fix."
+            bot_info["primary_bot"]["action"] = "Bot has stopped. Redeploy or restart to fix."
             
         # Determine MLJCM status
         if not settings.MLJCM_BOT_TOKEN:
             bot_info["mljcm_bot"]["status"] = "disabled"
         elif cm_bot_thread and cm_bot_thread.is_alive():
             bot_info["mljcm_bot"]["status"] = "healthy"
-        elif bot_initialized:
+        elif cm_bot_initialized:
             bot_info["mljcm_bot"]["status"] = "starting"
         else:
             bot_info["mljcm_bot"]["status"] = "dead"
@@ -635,7 +954,7 @@ def create_app() -> FastAPI:
         # 2. Bot threads check
         bot_threads = {}
         if settings.ENABLE_TELEGRAM_BOT:
-            if bot_thread and bot_thread.is_alive():
+            if primary_bot_alive():
                 bot_threads["primary"] = {"status": "running", "thread_alive": True}
             else:
                 bot_threads["primary"] = {"status": "dead", "thread_alive": False}
@@ -701,7 +1020,7 @@ def create_app() -> FastAPI:
         
         bot_status = "disabled"
         if settings.ENABLE_TELEGRAM_BOT:
-            if bot_thread and bot_thread.is_alive():
+            if primary_bot_alive():
                 bot_status = "running"
             else:
                 bot_status = "dead"
@@ -740,25 +1059,59 @@ def create_app() -> FastAPI:
             },
         }
 
+    # Telegram webhook endpoint
+    @app.post("/webhook", tags=["telegram"])
+    async def telegram_webhook(request: Request):
+        """Receive updates pushed by Telegram (webhook mode)"""
+        # Telegram echoes the secret_token given to set_webhook in this header;
+        # keeping it out of the URL keeps it out of proxy/access logs
+        token = request.headers.get("X-Telegram-Bot-Api-Secret-Token", "")
+        if not settings.WEBHOOK_SECRET or not hmac.compare_digest(token.encode(), settings.WEBHOOK_SECRET.encode()):
+            raise HTTPException(status_code=403, detail="Forbidden")
+        
+        application = bot_application
+        if application is None:
+            raise HTTPException(status_code=503, detail="Bot not running")
+        
+        try:
+            data = orjson.loads(await request.body())
+        except orjson.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="Malformed update")
+        if not isinstance(data, dict):
+            raise HTTPException(status_code=400, detail="Malformed update")
+        # Skip building the Update object graph for update types no handler reacts to
+        if bot_update_types.isdisjoint(data):
+            return {"ok": True}
+        
+        from telegram import Update
+        update = Update.de_json(data, application.bot)
+        schedule_webhook_update(application, update)
+        return ORJSONResponse({"ok": True}, status_code=202)
+    
     # Debug logs endpoint
     @app.get("/logs", tags=["debug"])
     async def get_logs(lines: int = 100):
         """Retrieve recent server logs for debugging"""
-        # Read from stdout redirect or a known log file if exists.
-        # Check standard destinations on render or local
+        # Recent lines come from the in-memory ring buffer; log files on disk
+        # (stdout redirects on render or local) are tailed for older history
+        recent = list(log_buffer.buffer)[-lines:] if lines > 0 else []
         log_paths = ['server.log', 'telegram_bot.log', 'nohup.out']
         result = {}
         
         for path in log_paths:
-            if os.path.exists(path):
-                try:
-                    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.readlines()
-                        result[path] = "".join(content[-lines:])
-                except Exception as e:
-                    result[path] = f"Error reading: {e}"
+            try:
+                content = _tail_log(path, lines)
+            except Exception as e:
+                result[path] = f"Error reading: {e}"
+                continue
+            if content is not None:
+                result[path] = content
         
-        return {"logs": result if result else "No log files found in root directory."}
+        return {
+            "lines": len(recent),
+            "recent": recent,
+            "logs": result if result else "No log files found in root directory.",
+        }
         
     # Import and register routers
     try:
@@ -788,14 +1141,29 @@ def main():
     
     settings = get_settings()
     
-    # Run with Uvicorn
+    workers = 1 if settings.DEBUG else int(os.getenv("WEB_CONCURRENCY", settings.WORKERS))
+    if workers > 1 and (settings.ENABLE_TELEGRAM_BOT or settings.MLJCM_BOT_TOKEN):
+        # Conversation state lives in-process and polling allows one consumer per token
+        logger.warning("Telegram bot enabled - running a single worker")
+        workers = 1
+    
+    reload = settings.RELOAD and settings.DEBUG
+    # Workers/reload need an import string, which re-imports this module as
+    # src.main; a single worker serves the app object already built here
+    target = "src.main:app" if workers > 1 or reload else app
+    
     uvicorn.run(
-        app,
+        target,
         host=settings.SERVER_HOST,
         port=settings.SERVER_PORT,
-        workers=1 if settings.DEBUG else settings.WORKERS,
-        reload=settings.RELOAD and settings.DEBUG,
+        workers=workers,
+        reload=reload,
+        access_log=False,
         log_level=settings.LOG_LEVEL.lower(),
+        # libuv-backed loop for cheaper network I/O (not available on Windows)
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        # C HTTP parser from uvicorn[standard] instead of pure-Python h11
+        http="httptools",
     )
 
 
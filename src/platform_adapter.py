@@ -91,14 +91,18 @@ class PlatformAdapter(ABC):
         
         try:
             while True:
-                messages = await self.receive_messages()
-                for msg in messages:
-                    await self.broadcast_message(msg)
+                try:
+                    messages = await self.receive_messages()
+                    for msg in messages:
+                        await self.broadcast_message(msg)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Error in {self.platform_name} adapter: {e}")
                 await asyncio.sleep(1)
-        except Exception as e:
-            logger.error(f"Error in {self.platform_name} adapter: {e}")
         finally:
             await self.disconnect()
+            logger.info(f"{self.platform_name} adapter stopped")
 
 
 class TelegramAdapter(PlatformAdapter):
@@ -15,6 +15,7 @@ import json
 import logging
 import traceback
 import hashlib
+import random
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from pathlib import Path
@@ -77,12 +78,16 @@ class SelfHealingEngine:
     def _start_health_monitor(self):
         """Background health monitoring thread"""
         def monitor():
+            delay = 300  # Check every 5 minutes
             while True:
                 try:
                     self._check_health()
-                    time.sleep(300)  # Check every 5 minutes
+                    delay = 300
                 except Exception as e:
-                    logger.error(f"Health monitor error: {e}")
+                    # Back off (capped at an hour) instead of spinning on a broken check
+                    delay = min(delay * 2, 3600)
+                    logger.error(f"Health monitor error: {e} (next check in ~{delay}s)")
+                time.sleep(delay * random.uniform(0.8, 1.2))
         
         thread = threading.Thread(target=monitor, daemon=True)
         thread.start()
@@ -5,12 +5,14 @@ Web API, CLI, and platform-specific interfaces
 """
 
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, ORJSONResponse, Response
 from typing import List, Optional, Dict, Any
 import asyncio
+from contextlib import asynccontextmanager
 from pathlib import Path
 import logging
 import json
+import orjson
 from datetime import datetime
 
 from src.hypersonic_core import hypersonic_core, ProcessingTask
@@ -21,35 +23,35 @@ from src.web_ui_clean import router as web_ui_router
 
 logger = logging.getLogger(__name__)
 
-app = FastAPI(
-    title="Universal Document Processor",
-    description="Hypersonic lightweight document processing platform",
-    version="1.0.0"
-)
-
-# Include web UI routes (clean version, web_ui.py deleted)
-app.include_router(web_ui_router)
-
-
 # ============================================================================
 # INITIALIZATION
 # ============================================================================
 
-@app.on_event("startup")
-async def startup():
-    """Initialize all systems"""
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize all systems on startup, shut them down gracefully on exit"""
     logger.info("Starting Universal Document Processor")
     await hypersonic_core.initialize()
     logger.info("All systems ready")
-
-
-@app.on_event("shutdown")
-async def shutdown():
-    """Graceful shutdown"""
+    
+    yield
+    
     logger.info("Shutting down systems")
     await hypersonic_core.shutdown()
 
 
+app = FastAPI(
+    title="Universal Document Processor",
+    description="Hypersonic lightweight document processing platform",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
+
+# Include web UI routes (clean version, web_ui.py deleted)
+app.include_router(web_ui_router)
+
+
 # ============================================================================
 # CORE PROCESSING ENDPOINTS
 # ============================================================================
@@ -300,12 +302,12 @@ async def slack_webhook(body: Dict[str, Any]) -> JSONResponse:
 # ============================================================================
 
 @app.get("/health")
-async def health_check() -> JSONResponse:
+async def health_check() -> ORJSONResponse:
     """Health check endpoint"""
     stats = hypersonic_core.get_performance_stats()
     cache_info = hypersonic_core.get_cache_info()
     
-    return JSONResponse({
+    return ORJSONResponse({
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
         "performance": stats,
@@ -331,36 +333,50 @@ async def get_stats() -> JSONResponse:
 # DOCUMENTATION
 # ============================================================================
 
+# The API index never changes, so it is serialized once at import time
+ROOT_BODY = orjson.dumps({
+    "name": "Universal Document Processor",
+    "version": "1.0.0",
+    "description": "Hypersonic lightweight platform for document processing and data integration",
+    "endpoints": {
+        "core_processing": [
+            "POST /api/process - Submit processing task",
+            "GET /api/task/{task_id} - Get task status"
+        ],
+        "data_integration": [
+            "POST /api/sources/register - Register data source",
+            "GET /api/sources/{source_id}/fetch - Fetch from source",
+            "POST /api/sources/fetch-all - Fetch from all sources"
+        ],
+        "learning": [
+            "POST /api/learn/analyze - Analyze document format",
+            "GET /api/learn/formats - Get learned formats",
+            "GET /api/learn/strategy/{format_id} - Get processing strategy"
+        ],
+        "monitoring": [
+            "GET /health - Health check",
+            "GET /stats - Comprehensive statistics"
+        ]
+    }
+})
+
+
 @app.get("/")
-async def root() -> Dict[str, Any]:
+async def root() -> Response:
     """Root endpoint with API documentation"""
-    return {
-        "name": "Universal Document Processor",
-        "version": "1.0.0",
-        "description": "Hypersonic lightweight platform for document processing and data integration",
-        "endpoints": {
-            "core_processing": [
-                "POST /api/process - Submit processing task",
-                "GET /api/task/{task_id} - Get task status"
-            ],
-            "data_integration": [
-                "POST /api/sources/register - Register data source",
-                "GET /api/sources/{source_id}/fetch - Fetch from source",
-                "POST /api/sources/fetch-all - Fetch from all sources"
-            ],
-            "learning": [
-                "POST /api/learn/analyze - Analyze document format",
-                "GET /api/learn/formats - Get learned formats",
-                "GET /api/learn/strategy/{format_id} - Get processing strategy"
-            ],
-            "monitoring": [
-                "GET /health - Health check",
-                "GET /stats - Comprehensive statistics"
-            ]
-        }
-    }
+    return Response(content=ROOT_BODY, media_type="application/json")
 
 
 if __name__ == "__main__":
+    import os
+    import sys
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Import string is required when running more than one worker
+    uvicorn.run(
+        "src.universal_gateway:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("WEB_CONCURRENCY", 1)),
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+    )
@@ -21,6 +21,7 @@ from telegram.ext import (
     filters,
 )
 from telegram.error import TelegramError
+from telegram.request import HTTPXRequest
 
 # Setup logging EARLY so it's available for import error handling
 logging.basicConfig(
@@ -880,8 +881,20 @@ class TelegramBotHandler:
         """Clean up temporary files for a user"""
         session_manager.clear_session(user_id)
 
+# Update types the handlers registered in build_application react to
+ALLOWED_UPDATES = ("message", "edited_message", "callback_query")
+
+
 def build_application(token: str) -> Application:
-    application = Application.builder().token(token).job_queue(None).build()
+    # HTTP/2 multiplexes concurrent handler calls to the Bot API over one warm connection;
+    # the longer write timeout covers sending consolidated result files back
+    request = HTTPXRequest(
+        connection_pool_size=64,
+        http_version="2",
+        read_timeout=30,
+        write_timeout=30,
+    )
+    application = Application.builder().token(token).request(request).job_queue(None).build()
     handler = TelegramBotHandler(token)
 
     conv_handler = ConversationHandler(
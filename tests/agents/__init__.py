@@ -0,0 +1 @@
+# tests/agents package
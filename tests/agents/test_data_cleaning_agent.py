@@ -0,0 +1,100 @@
+"""
+Unit Test: DataCleaningAgent chunked CSV cleaning
+
+Large CSVs are cleaned chunk by chunk with duplicates tracked across chunks;
+the result must match cleaning the whole file as one frame.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.agents import data_cleaning_agent
+from src.agents.data_cleaning_agent import DataCleaningAgent
+
+
+@pytest.fixture
+def roster_csv(tmp_path):
+    """CSV whose duplicate rows straddle 4-row chunk boundaries"""
+    rows = [
+        ["  Alice Smith", "ALICE@school.edu", 85],
+        ["Bob Johnson", "bob@school.edu", 72],
+        ["Charlie Brown", "charlie@school.edu", 55],
+        ["Diana Prince", "diana@school.edu", 88],
+        # chunk 2: duplicates of chunk 1 (one only after cleaning) and within the chunk
+        ["alice smith ", "alice@school.edu ", 85],
+        ["Bob Johnson", "bob@school.edu", 72],
+        ["Eve Adams", "eve@school.edu", 91],
+        ["Eve Adams", "eve@school.edu", 91],
+        # chunk 3: same person, different score, must be kept
+        ["Bob Johnson", "bob@school.edu", 60],
+        ["Diana Prince", "diana@school.edu", 88],
+    ]
+    path = tmp_path / "roster.csv"
+    pd.DataFrame(rows, columns=["Full Name", "Email", "Score"]).to_csv(path, index=False)
+    return path
+
+
+def test_chunked_cleaning_matches_single_frame(roster_csv, monkeypatch):
+    agent = DataCleaningAgent()
+    config = {'output_format': 'csv'}
+    
+    expected, _ = agent._clean_dataframe(pd.read_csv(roster_csv), config)
+    
+    monkeypatch.setattr(data_cleaning_agent, 'CSV_CHUNK_ROWS', 4)
+    rows_read, rows_written, report, output_path = agent._clean_csv_in_chunks(str(roster_csv), '.csv', config)
+    try:
+        chunked = pd.read_csv(output_path)
+    finally:
+        os.unlink(output_path)
+    
+    assert rows_read == 10
+    assert rows_written == len(expected) == 6
+    pd.testing.assert_frame_equal(chunked, expected.reset_index(drop=True))
+    assert "Removed 3 duplicate row(s) across chunks" in report['issues']
+
+
+def test_chunks_share_the_first_guessed_date_format(tmp_path, monkeypatch):
+    # Chunk 2 starts with a day-first date; guessed per chunk, its repeat of
+    # 03/04/2024 would parse as 3 April instead of 4 March and escape dedup
+    rows = [
+        ["alice@school.edu", "03/04/2024"],
+        ["bob@school.edu", "05/06/2024"],
+        ["carol@school.edu", "13/04/2024"],
+        ["alice@school.edu", "03/04/2024"],
+    ]
+    path = tmp_path / "exams.csv"
+    pd.DataFrame(rows, columns=["Email", "Exam Date"]).to_csv(path, index=False)
+    
+    monkeypatch.setattr(data_cleaning_agent, 'CSV_CHUNK_ROWS', 2)
+    rows_read, rows_written, report, output_path = DataCleaningAgent()._clean_csv_in_chunks(
+        str(path), '.csv', {'output_format': 'csv'})
+    try:
+        chunked = pd.read_csv(output_path)
+    finally:
+        os.unlink(output_path)
+    
+    assert (rows_read, rows_written) == (4, 3)
+    assert "Removed 1 duplicate row(s) across chunks" in report['issues']
+    assert chunked.loc[chunked['Email'] == 'alice@school.edu', 'Exam Date'].tolist() == ['2024-03-04']
+
+
+def test_excel_output_keeps_text_as_text(tmp_path):
+    pytest.importorskip("xlsxwriter")
+    openpyxl = pytest.importorskip("openpyxl")
+    df = pd.DataFrame({'Notes': ["=1+1", "https://school.edu/results"]})
+    
+    output_path = DataCleaningAgent()._save_cleaned_data(
+        df, str(tmp_path / "notes.csv"), {'output_format': 'xlsx', 'tmp_dir': str(tmp_path)})
+    ws = openpyxl.load_workbook(output_path).active
+    
+    # Neither cell may become a formula or a hyperlink
+    assert [(cell.value, cell.data_type, cell.hyperlink) for cell in ws['A'][1:]] == [
+        ("=1+1", 's', None), ("https://school.edu/results", 's', None)
+    ]
@@ -0,0 +1,120 @@
+"""
+Unit Test: GenericTableMergerAgent single-pass merge
+
+When every table has unique keys the tables are aligned in one concat; the
+result must be the same as chaining pairwise outer merges.
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.agents.merger_agent import GenericTableMergerAgent
+
+
+def pairwise_merge(first, tables, merge_column):
+    """Reference result: one outer merge per table"""
+    result = first
+    for df, name in tables:
+        result = pd.merge(result, df, on=merge_column, how='outer', suffixes=('', f'_from_{name}'))
+    return result
+
+
+def make_tables(duplicate_keys):
+    first = pd.DataFrame({
+        'Email': ['carol@x.edu', 'alice@x.edu', 'bob@x.edu'],
+        'Name': ['Carol', 'Alice', 'Bob'],
+        'Score': [70, 85, 60],
+    })
+    second = pd.DataFrame({
+        'Email': ['bob@x.edu', 'dave@x.edu', 'alice@x.edu'],
+        'Score': [65, 90, 88],
+    })
+    third = pd.DataFrame({
+        'Email': ['erin@x.edu', 'alice@x.edu'],
+        'Score': [77, 93],
+        'Grade': ['B', 'A'],
+    })
+    if duplicate_keys:
+        second = pd.concat([second, pd.DataFrame({'Email': ['bob@x.edu'], 'Score': [50]})],
+                           ignore_index=True)
+    return first, [(second, 'test_2.csv'), (third, 'test_3.csv')]
+
+
+def test_concat_on_key_matches_pairwise_merge():
+    first, tables = make_tables(duplicate_keys=False)
+    
+    assert GenericTableMergerAgent._keys_align(first, tables, 'Email')
+    merged = GenericTableMergerAgent._concat_on_key(first, tables, 'Email')
+    
+    pd.testing.assert_frame_equal(merged, pairwise_merge(first, tables, 'Email'))
+
+
+@pytest.mark.parametrize('duplicate_keys', [False, True])
+def test_merge_tables_matches_pairwise_merge(duplicate_keys):
+    agent = GenericTableMergerAgent()
+    first, tables = make_tables(duplicate_keys)
+    named = [(first, 'test_1.csv'), *tables]
+    dataframes = [{'df': df, 'name': name, 'columns_lower': agent._lowercase_column_map(df)}
+                  for df, name in named]
+    
+    merged = agent._merge_tables(dataframes, 'Email', {})
+    
+    # _merge_tables tags every table with a _source_<n> column before joining
+    sourced = [(df.assign(**{f'_source_{i}': name}), name) for i, (df, name) in enumerate(named, start=1)]
+    assert GenericTableMergerAgent._keys_align(sourced[0][0], sourced[1:], 'Email') is not duplicate_keys
+    pd.testing.assert_frame_equal(merged, pairwise_merge(sourced[0][0], sourced[1:], 'Email'))
+
+
+def test_polars_merge_matches_pairwise_merge():
+    pytest.importorskip("polars")
+    pytest.importorskip("pyarrow")
+    first, tables = make_tables(duplicate_keys=True)
+    
+    merged = GenericTableMergerAgent._merge_with_polars(first, tables, 'Email')
+    
+    pd.testing.assert_frame_equal(merged, pairwise_merge(first, tables, 'Email'))
+    # assert_frame_equal treats None and NaN alike; the output writers don't
+    text = merged.select_dtypes(include='object')
+    assert not text.map(lambda value: value is None).any().any()
+
+
+def test_process_returns_loaded_dtypes(tmp_path):
+    agent = GenericTableMergerAgent()
+    emails = ['alice@x.edu', 'bob@x.edu', 'carol@x.edu', 'dave@x.edu']
+    paths = []
+    for i in range(1, 3):
+        path = tmp_path / f'test_{i}.csv'
+        # Repetitive text and small ints are what _optimize_dtypes shrinks
+        pd.DataFrame({'Email': emails, 'Cohort': 'Spring', f'Attempts_{i}': 1}).to_csv(path, index=False)
+        paths.append(path)
+    
+    result = agent.process([{'path': str(path)} for path in paths],
+                           {'output_format': 'csv', 'tmp_dir': str(tmp_path)})
+    
+    assert result.success, result.errors
+    assert result.data.dtypes.to_dict() == pd.read_csv(paths[0]).dtypes.to_dict() | {
+        '_source_1': object, 'Cohort_from_test_2.csv': object, 'Attempts_2': 'int64', '_source_2': object
+    }
+
+
+def test_process_leaves_documents_untouched(tmp_path):
+    agent = GenericTableMergerAgent()
+    first, tables = make_tables(duplicate_keys=False)
+    documents = []
+    for i, df in enumerate([first, *(df for df, _ in tables)], start=1):
+        path = tmp_path / f'test_{i}.csv'
+        df.to_csv(path, index=False)
+        documents.append({'path': str(path), 'format': '.csv'})
+    original = [dict(doc) for doc in documents]
+    
+    result = agent.process(documents, {'output_format': 'csv', 'tmp_dir': str(tmp_path)})
+    
+    assert result.success, result.errors
+    assert documents == original
+    assert result.metadata['source_files'] == ['test_1.csv', 'test_2.csv', 'test_3.csv']
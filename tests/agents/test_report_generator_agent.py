@@ -0,0 +1,91 @@
+"""
+Unit Test: ReportGeneratorAgent document handling
+
+Reports are built from the caller's document dicts without modifying them, and
+the report helpers work when called directly.
+"""
+
+import copy
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.agents import report_generator_agent
+from src.agents.report_generator_agent import ReportGeneratorAgent
+
+
+def test_process_leaves_documents_untouched(tmp_path):
+    path = tmp_path / "scores.csv"
+    pd.DataFrame({'Email': ['a@x.edu', 'b@x.edu'], 'Score': [85, 72]}).to_csv(path, index=False)
+    documents = [{'path': str(path), 'format': '.csv'}]
+    original = copy.deepcopy(documents)
+    
+    result = ReportGeneratorAgent().process(documents, {'tmp_dir': str(tmp_path)})
+    
+    assert result.success, result.errors
+    assert documents == original
+
+
+def test_generate_report_without_validation(tmp_path):
+    df = pd.DataFrame({'Email': ['a@x.edu', None], 'Score': [85, 72]})
+    doc = {'path': str(tmp_path / "scores.csv")}
+    
+    report_path = ReportGeneratorAgent()._generate_report(df, doc, {'tmp_dir': str(tmp_path)})
+    try:
+        summary = pd.read_excel(report_path, sheet_name='Summary').set_index('Metric')['Value']
+    finally:
+        os.unlink(report_path)
+    
+    assert Path(report_path).name.startswith("scores_report_")
+    assert summary['Source File'] == "scores.csv"
+
+
+def read_report(report_path):
+    """All sheets of a report, minus the generation timestamp"""
+    sheets = pd.read_excel(report_path, sheet_name=None)
+    summary = sheets['Summary']
+    sheets['Summary'] = summary[summary['Metric'] != 'Report Generated'].reset_index(drop=True)
+    return sheets
+
+
+@pytest.fixture
+def report_pool(monkeypatch):
+    # The pool is only used with several CPUs; the spawned workers are real either way
+    monkeypatch.setattr(os, 'cpu_count', lambda: 2)
+    yield
+    report_generator_agent._discard_report_pool()
+
+
+def test_process_pool_matches_in_process(tmp_path, report_pool):
+    documents = []
+    for name, scores in [('first', [85, 72, None]), ('second', [55, 91, 91])]:
+        path = tmp_path / f"{name}.csv"
+        pd.DataFrame({'Email': ['a@x.edu', 'b@x.edu', None], 'Score': scores}).to_csv(path, index=False)
+        documents.append({'path': str(path), 'format': '.csv'})
+    agent = ReportGeneratorAgent()
+    serial_dir, parallel_dir = tmp_path / "serial", tmp_path / "parallel"
+    serial_dir.mkdir()
+    parallel_dir.mkdir()
+    
+    serial = agent.process(documents, {'tmp_dir': str(serial_dir)})
+    parallel = agent.process(documents, {'tmp_dir': str(parallel_dir), 'parallel': True,
+                                         'parallel_min_bytes': 0})
+    
+    assert serial.success, serial.errors
+    assert parallel.success, parallel.errors
+    # A broken pool would have been discarded and the batch run in-process
+    assert report_generator_agent._report_pool is not None
+    serial_reports = sorted(serial_dir.iterdir())
+    parallel_reports = sorted(parallel_dir.iterdir())
+    assert len(serial_reports) == len(parallel_reports) == 2
+    for serial_path, parallel_path in zip(serial_reports, parallel_reports):
+        expected, actual = read_report(serial_path), read_report(parallel_path)
+        assert expected.keys() == actual.keys()
+        for sheet in expected:
+            pd.testing.assert_frame_equal(actual[sheet], expected[sheet])
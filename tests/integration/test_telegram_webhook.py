@@ -0,0 +1,53 @@
+"""
+Integration Test: Telegram webhook request validation
+
+An authenticated push whose body is not a JSON object must be rejected with
+400 rather than failing with 500, which Telegram would keep redelivering.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src import main
+from src.config import get_settings
+
+SECRET = "test-secret"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(get_settings(), "WEBHOOK_SECRET", SECRET)
+    monkeypatch.setattr(main, "bot_application", object())
+    # No context manager: the lifespan (bot startup) is not run
+    return TestClient(main.create_app())
+
+
+def post_update(client, body):
+    return client.post(
+        "/webhook",
+        content=body,
+        headers={"X-Telegram-Bot-Api-Secret-Token": SECRET, "Content-Type": "application/json"},
+    )
+
+
+def test_malformed_json_is_rejected(client):
+    assert post_update(client, b"{not json").status_code == 400
+
+
+@pytest.mark.parametrize("body", [b"[]", b"1", b'"message"'])
+def test_non_object_json_is_rejected(client, body):
+    assert post_update(client, body).status_code == 400
+
+
+def test_unhandled_update_type_is_acknowledged(client):
+    response = post_update(client, b'{"update_id": 1, "poll": {}}')
+    assert response.status_code == 200
+    assert response.json() == {"ok": True}